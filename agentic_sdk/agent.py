@@ -1,12 +1,71 @@
 from langgraph.graph import StateGraph
 from .state import ConversationState
+from .history import ConversationHistory
+from .events import EventBus
+from .usage import UsageTracker
+from .tone import create_tone_backend
+from .utils.deadlines import CallExecutor, CallPolicy
 from .utils.nodes import agent_a_node, agent_b_node
 from .config import load_config, ConversationMode
-from .transcript import save_transcript, save_text_transcript
+from .transcript import save_transcript, save_text_transcript, save_usage_report
 from .audio import generate_audio, merge_audio_clips
 import os
+from functools import lru_cache
 from typing import List
 
+
+def _router(state: ConversationState):
+    """
+    Determine who speaks next based on turn count and current speaker.
+    Rules:
+    - Agent A starts (turn 0)
+    - Agents alternate turns
+    - Conversation ends when max_turns is reached
+    """
+    if state.turn >= state.max_turns:
+        print(f"Conversation ending: reached max turns ({state.max_turns})")
+        return None  # This maps to '__end__'
+
+    next_speaker = state.speaker
+    print(f"Turn {state.turn}: Next speaker is {next_speaker}")
+    return next_speaker
+
+
+def _build_conversation_graph():
+    """Build and compile the LangGraph for AI-generated conversations with proper turn-taking logic."""
+    builder = StateGraph(ConversationState)
+    builder.add_node("agent_a", agent_a_node)
+    builder.add_node("agent_b", agent_b_node)
+
+    # Agent A always starts the conversation
+    builder.set_entry_point("agent_a")
+
+    # Conditional edges with proper turn-taking
+    builder.add_conditional_edges("agent_a", _router, {
+        "agent_b": "agent_b",
+        None: "__end__"
+    })
+
+    builder.add_conditional_edges("agent_b", _router, {
+        "agent_a": "agent_a",
+        None: "__end__"
+    })
+
+    app = builder.compile()
+    print("Unscripted conversation graph initialized with turn-taking logic")
+    return app
+
+
+@lru_cache(maxsize=1)
+def _get_conversation_graph():
+    """Return the compiled conversation graph, shared by every AgentSimulator.
+
+    The graph holds no per-conversation data: state is passed to invoke() and the
+    conversation config travels in the runtime config, so one compiled instance is reused.
+    """
+    return _build_conversation_graph()
+
+
 class AgentSimulator:
     def __init__(self, config_path: str = None, config: dict = None):
         """Initialize AgentSimulator with configuration.
@@ -17,7 +76,12 @@ class AgentSimulator:
         self.config = None
         self.state = None
         self.app = None
-        self._observers = []  # For observability callbacks
+        self.history = None  # Full message history (optionally spilled to disk)
+        self.usage = None  # Token usage and cost of model calls
+        self._call_policies = {}  # Stage name -> CallPolicy (deadlines, retries, hedging)
+        self._call_executor = None  # Worker threads shared by this simulator's call policies
+        self._tone_backend = None  # Emotion classifier, built with this simulator's call policies
+        self._events = EventBus()  # Delivers observer callbacks off the run thread
         
         if config_path:
             self.configure_from_file(config_path)
@@ -34,7 +98,33 @@ class AgentSimulator:
         self._initialize_state()
     
     def _initialize_state(self):
-        self.state = ConversationState(max_turns=self.config.turns, config=self.config.dict())
+        self.state = ConversationState(max_turns=self.config.turns)
+        if self.history is not None:
+            self.history.close()
+        self.history = ConversationHistory(
+            window=self.config.history_window,
+            store_path=self.config.history_store_path,
+        )
+        self.usage = UsageTracker(pricing=self.config.pricing)
+        if self._call_executor is not None:
+            self._call_executor.shutdown()
+        self._call_executor = CallExecutor(max_workers=self.config.call_max_workers)
+        self._call_policies = {
+            stage: CallPolicy(
+                stage,
+                timeout=getattr(self.config, f"{stage}_timeout"),
+                retries=self.config.call_retries,
+                hedge_percentile=self.config.hedge_percentile,
+                executor=self._call_executor,
+            )
+            for stage in ("generation", "emotion", "evaluation")
+        }
+        self._tone_backend = create_tone_backend(self.config.tone_backend, policies=self._call_policies)
+        self._events.configure(
+            max_queue_size=self.config.event_queue_size,
+            overflow_policy=self.config.event_overflow_policy,
+            max_batch_size=self.config.event_batch_size,
+        )
 
         # Only set up LangGraph for unscripted conversations
         if self.config.mode == ConversationMode.UNSCRIPTED:
@@ -43,64 +133,47 @@ class AgentSimulator:
             self.app = None  # No graph needed for scripted conversations
 
     def _setup_unscripted_conversation(self):
-        """Set up the LangGraph for AI-generated conversations with proper turn-taking logic."""
-        builder = StateGraph(ConversationState)
-        builder.add_node("agent_a", agent_a_node)
-        builder.add_node("agent_b", agent_b_node)
-
-        # Agent A always starts the conversation
-        builder.set_entry_point("agent_a")
-
-        def router(state: ConversationState):
-            """
-            Determine who speaks next based on turn count and current speaker.
-            Rules:
-            - Agent A starts (turn 0)
-            - Agents alternate turns
-            - Conversation ends when max_turns is reached
-            """
-            if state.turn >= state.max_turns:
-                print(f"Conversation ending: reached max turns ({state.max_turns})")
-                return None  # This maps to '__end__'
-            
-            next_speaker = state.speaker
-            print(f"Turn {state.turn}: Next speaker is {next_speaker}")
-            return next_speaker
+        """Attach the shared, pre-compiled LangGraph for AI-generated conversations."""
+        self.app = _get_conversation_graph()
 
-        # Conditional edges with proper turn-taking
-        builder.add_conditional_edges("agent_a", router, {
-            "agent_b": "agent_b",
-            None: "__end__"
-        })
-
-        builder.add_conditional_edges("agent_b", router, {
-            "agent_a": "agent_a", 
-            None: "__end__"
-        })
+    def close(self, timeout: float = None):
+        """Release resources held by the simulator (event worker, call workers, on-disk history store).
 
-        self.app = builder.compile()
-        print("Unscripted conversation graph initialized with turn-taking logic")
+        Queued observer events are delivered first, waiting at most ``timeout`` seconds.
+        """
+        self._events.close(timeout)
+        if self._call_executor is not None:
+            self._call_executor.shutdown()
+        if self.history is not None:
+            self.history.close()
 
-    def add_observer(self, callback):
+    def add_observer(self, callback, batched: bool = False):
         """Add an observer callback for monitoring conversation progress.
+
+        Callbacks run on a background worker, never on the conversation thread.
         
         Args:
-            callback: Function that accepts (event_type, data) parameters
+            callback: Function that accepts (event_type, data) parameters, or a list of
+                (event_type, data) tuples when ``batched`` is True
+            batched: Receive queued events in batches (useful for slow consumers such as DB writers)
         """
-        self._observers.append(callback)
+        self._events.subscribe(callback, batched=batched)
     
     def remove_observer(self, callback):
         """Remove an observer callback."""
-        if callback in self._observers:
-            self._observers.remove(callback)
+        self._events.unsubscribe(callback)
+    
+    def flush_observers(self, timeout: float = None) -> bool:
+        """Block until all queued observer events have been delivered, or ``timeout`` seconds pass.
+
+        run() returns without waiting for observers; call this when they must have seen
+        every event. Returns False on timeout.
+        """
+        return self._events.flush(timeout)
     
     def _notify_observers(self, event_type: str, data: dict):
-        """Notify all observers of an event."""
-        for callback in self._observers:
-            try:
-                callback(event_type, data)
-            except Exception as e:
-                print(f"Observer callback error: {e}")
+        """Queue an event for delivery to all observers."""
+        self._events.publish(event_type, data)
 
     def run(self, observe: bool = True):
         """Run the conversation based on the configured mode.
@@ -126,7 +199,7 @@ class AgentSimulator:
                 
             if observe:
                 self._notify_observers("conversation_completed", {
-                    "total_messages": len(self.state.messages),
+                    "total_messages": len(self.history),
                     "final_turn": self.state.turn
                 })
                 
@@ -149,19 +222,36 @@ class AgentSimulator:
         if not self.config.scripted_messages:
             raise ValueError("Scripted mode requires 'scripted_messages' in configuration")
         
-        # Import tone detection function
-        from .utils.nodes import detect_conversation_tone
-        
         # Convert scripted messages to show dynamic emotion format
         base_tone = self.config.tone
-        formatted_messages = []
+        tone_backend = self._tone_backend
+        self.history.clear()
+        self.usage.reset()
         
-        for i, msg in enumerate(self.config.scripted_messages[:self.config.turns]):
+        scripted = self.config.scripted_messages[:self.config.turns]
+        
+        # Backends that batch classify every line up front; others are called line by line,
+        # so each event is emitted as soon as its line has been classified
+        detected = {}
+        if tone_backend.supports_batch:
+            lines = [(i, *msg.split(":", 1)) for i, msg in enumerate(scripted) if ":" in msg]
+            emotions = tone_backend.detect_batch(
+                [content.strip() for _, _, content in lines],
+                base_tone,
+                self.usage,
+                agents=["agent_a" if "Agent A" in speaker else "agent_b" for _, speaker, _ in lines],
+                turns=[i + 1 for i, _, _ in lines],
+            )
+            detected = {i: emotion for (i, _, _), emotion in zip(lines, emotions)}
+        
+        for i, msg in enumerate(scripted):
             if ":" in msg:
                 speaker, content = msg.split(":", 1)
-                
-                # Detect dynamic emotion based on message content
-                detected_emotion = detect_conversation_tone(content.strip(), base_tone)
+                if i in detected:
+                    detected_emotion = detected[i]
+                else:
+                    agent = "agent_a" if "Agent A" in speaker else "agent_b"
+                    detected_emotion = tone_backend.detect(content.strip(), base_tone, self.usage, agent, i + 1)
                 
                 # Convert "Agent A:" to "Agent A (detected_emotion):"
                 if "Agent A" in speaker:
@@ -169,7 +259,7 @@ class AgentSimulator:
                 elif "Agent B" in speaker:
                     formatted_speaker = f"Agent B ({detected_emotion})"
                     
-                formatted_messages.append(f"{formatted_speaker}:{content}")
+                self.history.append(f"{formatted_speaker}:{content}")
                 
                 if observe:
                     self._notify_observers("message_processed", {
@@ -181,12 +271,12 @@ class AgentSimulator:
                     
                 print(f"Turn {i+1}: {formatted_speaker} - detected emotion: {detected_emotion}")
             else:
-                formatted_messages.append(msg)
+                self.history.append(msg)
         
-        self.state.messages = formatted_messages
-        self.state.turn = len(self.state.messages)
+        self.state.messages = self.history.recent()
+        self.state.turn = len(self.history)
         
-        print(f"Loaded {len(self.state.messages)} scripted messages with dynamic tone detection")
+        print(f"Loaded {len(self.history)} scripted messages with dynamic tone detection")
         return self.state
 
     def _run_unscripted_conversation(self, observe: bool = True):
@@ -210,20 +300,45 @@ class AgentSimulator:
         self.state.turn = 0
         self.state.speaker = "agent_a"  # Agent A always starts
         self.state.messages = []
+        self.history.clear()
+        self.usage.reset()
         
         print("Starting conversation with Agent A...")
         
         try:
-            # Run the conversation through LangGraph
-            final_state = self.app.invoke(self.state)
+            # Run the conversation through LangGraph; config is passed at runtime, not in state.
+            # Graph state only keeps the latest exchange, so each turn is recorded from the
+            # per-node updates as they stream out.
+            for step in self.app.stream(
+                {
+                    "messages": [],
+                    "turn": self.state.turn,
+                    "max_turns": self.state.max_turns,
+                    "speaker": self.state.speaker,
+                },
+                config={
+                    "configurable": {
+                        "conversation": self.config.dict(),
+                        "usage": self.usage,
+                        "call_policies": self._call_policies,
+                        "tone_backend": self._tone_backend,
+                    },
+                    # One graph step per turn, plus headroom for the entry step
+                    "recursion_limit": self.state.max_turns + 5,
+                },
+                stream_mode="updates",
+            ):
+                for update in step.values():
+                    for msg in update.get("messages", []):
+                        self.history.append(msg)
+                        if observe:
+                            self._notify_turn(msg)
+                    self.state.turn = update.get("turn", self.state.turn)
+                    self.state.speaker = update.get("speaker", self.state.speaker)
             
-            # Convert result back to ConversationState if it's a dict
-            if isinstance(final_state, dict):
-                self.state = ConversationState(**final_state)
-            else:
-                self.state = final_state
+            self.state.messages = self.history.recent()
                 
-            print(f"Conversation completed with {len(self.state.messages)} exchanges")
+            print(f"Conversation completed with {len(self.history)} exchanges")
             
         except Exception as e:
             print(f"Error during conversation: {e}")
@@ -231,10 +346,26 @@ class AgentSimulator:
         
         return self.state
 
+    def _notify_turn(self, msg: str):
+        """Emit a per-turn event for a message formatted as 'Agent X (emotion): content'."""
+        speaker, _, content = msg.partition(":")
+        emotion = speaker[speaker.find("(") + 1:speaker.rfind(")")] if "(" in speaker else None
+        self._notify_observers("message_processed", {
+            "turn": len(self.history),
+            "speaker": speaker.strip(),
+            "emotion": emotion,
+            "content_preview": content.strip()[:100]
+        })
+
     def get_state(self):
-        """Get current conversation state for observation."""
+        """Get current conversation state for observation.
+
+        Only the in-memory messages are returned (all of them unless ``history_window``
+        is set); iterate ``self.history`` for the full conversation.
+        """
         return {
-            "messages": self.state.messages if self.state else [],
+            "messages": self.history.recent() if self.history else [],
+            "total_messages": len(self.history) if self.history else 0,
             "turn": self.state.turn if self.state else 0,
             "max_turns": self.state.max_turns if self.state else 0,
             "config": self.config.dict() if self.config else {}
@@ -246,22 +377,28 @@ class AgentSimulator:
             return {"status": "not_initialized"}
             
         return {
-            "total_messages": len(self.state.messages),
+            "total_messages": len(self.history),
             "current_turn": self.state.turn,
             "progress": self.state.turn / self.state.max_turns if self.state.max_turns > 0 else 0,
             "mode": self.config.mode.value if self.config else "unknown",
-            "completed": self.state.turn >= self.state.max_turns
+            "completed": self.state.turn >= self.state.max_turns,
+            "memory": self.history.memory_usage(),
+            "observer_events": self._events.stats(),
+            "usage": self.usage.summary(),
+            "call_policies": {stage: policy.stats() for stage, policy in self._call_policies.items()}
         }
 
     def save_transcript(self):
-        """Save the conversation transcript in both JSON and text formats in mode-specific folders."""
+        """Save the conversation transcript in both JSON and text formats, plus the usage report, in mode-specific folders."""
         mode_folder = f"outputs/{self.config.mode.value}"
         
         # Save in mode-specific folders
-        save_transcript(self.state.messages, f"{mode_folder}/transcript.json")
-        save_text_transcript(self.state.messages, f"{mode_folder}/transcript.txt")
+        save_transcript(self.history, f"{mode_folder}/transcript.json")
+        save_text_transcript(self.history, f"{mode_folder}/transcript.txt")
+        save_usage_report(self.usage.summary(), f"{mode_folder}/usage.json")
         
         print(f"Transcript saved to {mode_folder}/transcript.txt and {mode_folder}/transcript.json")
+        print(f"Usage report saved to {mode_folder}/usage.json")
 
     def generate_audio(self):
         """Generate audio files for each message and merge them into a single conversation audio in mode-specific folders."""
@@ -274,7 +411,7 @@ class AgentSimulator:
         
         print("Generating audio for conversation...")
         
-        for idx, msg in enumerate(self.state.messages):
+        for idx, msg in enumerate(self.history):
             if ":" in msg:
                 speaker, content = msg.split(":", 1)
                 # Extract Agent A or Agent B from speaker label like "Agent A (persona)"
@@ -23,6 +23,37 @@ class ConversationConfig(BaseModel):
     agent_b_persona: Optional[str] = None
     conversation_context: Optional[str] = None
     
+    # "separate": one call for the reply, another to label its emotion.
+    # "combined": reply and emotion label requested together as structured output.
+    emotion_mode: str = "separate"
+    # Emotion classifier for scripted lines and "separate" mode: "llm" or "lexicon" (offline, see tone.py)
+    tone_backend: str = "llm"
+    
+    # Keep only the last N messages in memory and spill older ones to disk (None = keep all)
+    history_window: Optional[int] = None
+    history_store_path: Optional[str] = None  # SQLite file; a temporary file is used if unset
+    
+    # Observer event delivery (see events.py)
+    event_queue_size: int = 1000
+    event_overflow_policy: str = "block"  # "block" or "drop" when the queue is full
+    event_batch_size: int = 50
+    
+    # Price table in USD per 1M tokens, e.g. {"gpt-4o-mini": {"prompt": 0.15, "completion": 0.60}}.
+    # Entries are merged over the defaults in usage.py.
+    pricing: Optional[Dict[str, Dict[str, float]]] = None
+    
+    # Per-call deadlines in seconds (None = wait indefinitely); timed-out calls are retried
+    # call_retries times. A missed emotion deadline falls back to the default emotion and a
+    # missed evaluation deadline skips the evaluation; generation raises DeadlineExceeded.
+    generation_timeout: Optional[float] = None
+    emotion_timeout: Optional[float] = None
+    evaluation_timeout: Optional[float] = None
+    call_retries: int = 1
+    # Worker threads per simulator for deadline-bound calls; abandoned calls hold a worker until they finish
+    call_max_workers: int = 8
+    # Send a hedged duplicate request once a call runs past this percentile of recent latencies
+    hedge_percentile: Optional[float] = None
+    
     class Config:
         extra = "ignore"  # Ignore unused YAML fields
 
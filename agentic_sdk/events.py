@@ -0,0 +1,147 @@
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from .utils.logger import logger
+
+OVERFLOW_POLICIES = ("block", "drop")
+
+_STOP = object()
+
+
+class EventBus:
+    """Deliver observer events from a bounded queue on a background worker thread.
+
+    publish() only enqueues, so observers never run on the conversation thread. When
+    observers fall behind, the worker drains up to ``max_batch_size`` queued events at
+    once; observers subscribed with ``batched=True`` receive them in a single call as a
+    list of ``(event_type, data)`` tuples. A full queue either blocks the publisher
+    ("block") or discards the event ("drop").
+    """
+
+    def __init__(self, max_queue_size: int = 1000, overflow_policy: str = "block", max_batch_size: int = 50):
+        self._observers = []  # (callback, batched) pairs
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker = None
+        self.delivered_events = 0
+        self.dropped_events = 0
+        self.configure(max_queue_size, overflow_policy, max_batch_size)
+
+    def configure(self, max_queue_size: int = 1000, overflow_policy: str = "block", max_batch_size: int = 50):
+        """Apply new queue settings, draining and stopping the current worker first."""
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"event_overflow_policy must be one of {OVERFLOW_POLICIES}, got '{overflow_policy}'")
+        if max_queue_size < 1 or max_batch_size < 1:
+            raise ValueError("event_queue_size and event_batch_size must be positive")
+        self.close()
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.max_batch_size = max_batch_size
+
+    def subscribe(self, callback: Callable, batched: bool = False):
+        with self._lock:
+            self._observers.append((callback, batched))
+
+    def unsubscribe(self, callback: Callable):
+        with self._lock:
+            self._observers = [(cb, batched) for cb, batched in self._observers if cb != callback]
+
+    def publish(self, event_type: str, data: dict):
+        """Queue an event for delivery; never calls observers directly."""
+        if not self._observers:
+            return
+        self._ensure_worker()
+        if self.overflow_policy == "drop":
+            try:
+                self._queue.put_nowait((event_type, data))
+            except queue.Full:
+                self.dropped_events += 1
+                logger.warning(f"Observer queue full, dropped '{event_type}' event ({self.dropped_events} dropped so far)")
+        else:
+            self._queue.put((event_type, data))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been delivered. Returns False on timeout."""
+        if self._queue is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None):
+        """Deliver pending events and stop the worker. A later publish() restarts it.
+
+        With a timeout, a worker still busy when it expires is left to finish on its own
+        (it is a daemon thread) and its undelivered events are discarded.
+        """
+        if self._worker is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+            self._worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        except queue.Full:
+            pass
+        if self._worker.is_alive():
+            logger.warning(f"Observer worker did not finish within {timeout}s, {self._queue.qsize()} events undelivered")
+        self._worker = None
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "delivered": self.delivered_events,
+            "dropped": self.dropped_events,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._queue = queue.Queue(maxsize=self.max_queue_size)
+                self._worker = threading.Thread(target=self._run, args=(self._queue,), name="agentic-sdk-events", daemon=True)
+                self._worker.start()
+
+    def _run(self, events: queue.Queue):
+        while True:
+            batch = [events.get()]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(events.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in batch
+            pending = [event for event in batch if event is not _STOP]
+            if pending:
+                self._deliver(pending)
+            for _ in batch:
+                events.task_done()
+            if stop:
+                return
+
+    def _deliver(self, batch: list):
+        with self._lock:
+            observers = list(self._observers)
+        for callback, batched in observers:
+            if batched:
+                self._call(callback, batch)
+            else:
+                for event_type, data in batch:
+                    self._call(callback, event_type, data)
+        self.delivered_events += len(batch)
+
+    @staticmethod
+    def _call(callback: Callable, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"Observer callback error: {e}")
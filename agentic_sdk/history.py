@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from collections import deque
+from itertools import islice
+from typing import Iterator, List, Optional
+
+# Messages are moved to disk in batches rather than one INSERT per turn
+SPILL_BATCH_SIZE = 64
+# Spilled messages are read back in pages of this many rows during iteration
+READ_PAGE_SIZE = 256
+
+
+class ConversationHistory:
+    """Ordered conversation messages with an optional memory bound.
+
+    With ``window=None`` every message stays in memory. With a window, only the most
+    recent ``window`` messages (plus at most one pending spill batch) are kept in memory;
+    older ones are moved to an append-only SQLite store and read back lazily on iteration.
+
+    The history may be iterated from another thread than the one appending to it (e.g. an
+    observer). After close() it raises ValueError on use; len() and memory_usage() still work.
+    """
+
+    def __init__(self, window: Optional[int] = None, store_path: Optional[str] = None):
+        if window is not None and window < 1:
+            raise ValueError("history_window must be a positive integer")
+        self.window = window
+        self.store_path = store_path
+        self._recent = deque()
+        self._spilled = 0
+        self._conn = None
+        self._owns_store = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return self._spilled + len(self._recent)
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield every message in order, streaming spilled ones from disk page by page."""
+        position = 0
+        while True:
+            with self._lock:
+                self._check_open()
+                if position < self._spilled:
+                    rows = self._conn.execute(
+                        "SELECT content FROM messages WHERE idx >= ? ORDER BY idx LIMIT ?",
+                        (position, READ_PAGE_SIZE),
+                    ).fetchall()
+                    recent = None
+                else:
+                    # Snapshot under the lock so a concurrent spill cannot skip or repeat messages
+                    recent = list(self._recent)[position - self._spilled:]
+            if recent is not None:
+                yield from recent
+                return
+            for (content,) in rows:
+                yield content
+            position += len(rows)
+
+    def append(self, message: str):
+        with self._lock:
+            self._check_open()
+            self._recent.append(message)
+            if self.window is not None and len(self._recent) >= self.window + SPILL_BATCH_SIZE:
+                self._spill(len(self._recent) - self.window)
+
+    def extend(self, messages):
+        for message in messages:
+            self.append(message)
+
+    def recent(self, n: Optional[int] = None) -> List[str]:
+        """Return the last ``n`` in-memory messages (all of them if ``n`` is None)."""
+        with self._lock:
+            self._check_open()
+            recent = list(self._recent)
+        if n is None:
+            return recent
+        return recent[-n:] if n > 0 else []
+
+    def clear(self):
+        """Drop all messages, including the ones already spilled to disk."""
+        with self._lock:
+            self._check_open()
+            self._recent.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM messages")
+                self._conn.commit()
+            self._spilled = 0
+
+    def close(self):
+        """Close the on-disk store, deleting it if it was a temporary file. Further use raises ValueError."""
+        with self._lock:
+            self._closed = True
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                if self._owns_store and os.path.exists(self.store_path):
+                    os.remove(self.store_path)
+
+    def memory_usage(self) -> dict:
+        """Report how much of the history is resident in memory vs. spilled to disk."""
+        with self._lock:
+            recent = list(self._recent)
+            deque_bytes = sys.getsizeof(self._recent)
+            spilled = self._spilled
+            store_path = self.store_path if self._conn is not None else None
+        store_bytes = 0
+        if store_path is not None and os.path.exists(store_path):
+            store_bytes = os.path.getsize(store_path)
+        return {
+            "window": self.window,
+            "in_memory_messages": len(recent),
+            "in_memory_bytes": deque_bytes + sum(sys.getsizeof(m) for m in recent),
+            "spilled_messages": spilled,
+            "store_path": store_path,
+            "store_bytes": store_bytes,
+        }
+
+    def _check_open(self):
+        if self._closed:
+            raise ValueError("ConversationHistory is closed")
+
+    def _open_store(self):
+        if self.store_path is None:
+            fd, self.store_path = tempfile.mkstemp(prefix="conversation_", suffix=".sqlite")
+            os.close(fd)
+            self._owns_store = True
+        else:
+            directory = os.path.dirname(self.store_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        # Used from other threads too (e.g. iterated by an observer); access is serialised by _lock
+        self._conn = sqlite3.connect(self.store_path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS messages (idx INTEGER PRIMARY KEY, content TEXT NOT NULL)")
+        # A reused store path starts a fresh conversation
+        self._conn.execute("DELETE FROM messages")
+        self._conn.commit()
+
+    def _spill(self, count: int):
+        if self._conn is None:
+            self._open_store()
+        # Called with _lock held. Messages leave memory only once they are on disk, so a
+        # failed write loses nothing and the count stays consistent.
+        batch = [(self._spilled + i, message) for i, message in enumerate(islice(self._recent, count))]
+        self._conn.executemany("INSERT INTO messages (idx, content) VALUES (?, ?)", batch)
+        self._conn.commit()
+        for _ in range(count):
+            self._recent.popleft()
+        self._spilled += count
@@ -1,9 +1,20 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Annotated, List
+
+# Nodes only read the previous message, so graph state keeps just the latest exchange.
+# The full history lives in AgentSimulator.history (see history.py).
+GRAPH_MESSAGE_WINDOW = 2
+
+
+def append_recent_messages(left: List[str], right: List[str]) -> List[str]:
+    """Append reducer for the messages channel that keeps only the most recent messages."""
+    return (left + right)[-GRAPH_MESSAGE_WINDOW:]
+
 
 class ConversationState(BaseModel):
-    messages: List[str] = []
+    # Append-reducer channel: graph nodes return only the new turn(s)
+    messages: Annotated[List[str], append_recent_messages] = []
     turn: int = 0
     max_turns: int = 10
     speaker: str = "agent_a"  # agent_a or agent_b
-    config: Optional[dict] = None
\ No newline at end of file
+    # Configuration is not part of the state: nodes read it from RunnableConfig["configurable"]["conversation"]
@@ -0,0 +1,155 @@
+import re
+from typing import List, Optional
+
+import numpy as np
+
+DEFAULT_EMOTION = "thoughtful"
+
+# Emotion words per label. Labels are single lowercase words so they pass the same
+# validation as LLM-detected emotions and can be used directly in speaker tags and TTS.
+EMOTION_LEXICON = {
+    "joyful": ["happy", "happier", "happiest", "happiness", "joy", "joyful", "glad", "delighted", "delightful", "cheerful", "pleased", "lovely", "wonderful", "love", "loved"],
+    "enthusiastic": ["excited", "exciting", "excitement", "thrilled", "thrilling", "amazing", "fantastic", "incredible", "awesome", "eager", "passionate"],
+    "sad": ["sad", "sadly", "sadness", "unhappy", "sorrow", "grief", "grieving", "heartbroken", "miserable", "depressed", "tragic", "terrible", "lonely", "gloomy", "upset"],
+    "angry": ["angry", "anger", "furious", "fury", "outraged", "outrageous", "livid", "enraged", "rage", "infuriating", "hate", "hateful", "mad"],
+    "fearful": ["afraid", "fear", "fearful", "scared", "scary", "terrified", "terrifying", "frightened", "frightening", "panic", "dread", "horrified"],
+    "frustrated": ["frustrating", "frustrated", "frustration", "annoying", "annoyed", "irritated", "irritating", "unfair", "ridiculous"],
+    "surprised": ["surprised", "surprising", "surprise", "astonished", "astonishing", "shocked", "shocking", "unexpected", "stunned"],
+    "curious": ["curious", "curiosity", "wonder", "wondering", "interesting", "interested", "fascinating", "fascinated", "intriguing", "intrigued"],
+    "concerned": ["concern", "concerned", "concerning", "worry", "worried", "worrying", "alarming", "troubling", "troubled", "danger", "dangerous", "threat", "harm", "harmful"],
+    "apprehensive": ["uneasy", "nervous", "anxious", "anxiety", "hesitant", "wary", "apprehensive", "tense"],
+    "optimistic": ["hope", "hopeful", "hopefully", "optimistic", "promising", "encouraging"],
+    "skeptical": ["doubt", "doubtful", "doubts", "skeptical", "unconvinced", "questionable", "dubious", "unclear", "debatable"],
+    "appreciative": ["thank", "thanks", "thankful", "appreciate", "appreciated", "grateful", "gratitude", "excellent", "admire"],
+    "confident": ["certainly", "definitely", "undoubtedly", "convinced", "certain", "assured"],
+    "empathetic": ["sorry", "sympathy", "sympathize", "compassion", "compassionate", "understandable", "empathize", "empathy"],
+    "reflective": ["reflect", "reflecting", "reflection", "ponder", "pondering", "contemplate", "nuanced", "introspective"],
+    "pragmatic": ["practical", "pragmatic", "realistic", "feasible", "workable"],
+}
+
+# Weaker cues: discourse words that hint at a stance without naming an emotion. They score
+# CUE_WEIGHT each, so it takes several of them to outweigh a single emotion word.
+TONE_CUES = {
+    "curious": ["explore", "question", "questions"],
+    "concerned": ["risk", "risks", "bias"],
+    "optimistic": ["opportunity", "opportunities", "improve", "benefit", "benefits", "progress"],
+    "skeptical": ["however", "although"],
+    "appreciative": ["agree", "absolutely", "exactly", "valid"],
+    "confident": ["clearly", "evidence"],
+    "empathetic": ["understand", "difficult", "support"],
+    "frustrated": ["problem", "problems", "fail", "failed"],
+    "pragmatic": ["approach", "steps", "implement", "testing", "standards", "regulation", "monitoring"],
+    "reflective": ["perhaps", "historically", "consider", "considering", "broader", "balance", "implications"],
+}
+CUE_WEIGHT = 0.25
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+class ToneBackend:
+    """Interface for emotion classifiers used to label each message.
+
+    ``policies`` maps stage name to the simulator's CallPolicy objects, for backends that
+    make remote calls; subclasses pass it on to ``ToneBackend.__init__``.
+    """
+
+    name = None
+    # True if detect_batch scores many messages more cheaply than one detect() call per message
+    supports_batch = False
+
+    def __init__(self, policies: Optional[dict] = None):
+        self.policies = policies or {}
+
+    def detect(self, message: str, base_tone: str = "professional", usage=None,
+               agent: Optional[str] = None, turn: Optional[int] = None) -> str:
+        return self.detect_batch([message], base_tone, usage, [agent], [turn])[0]
+
+    def detect_batch(self, messages: List[str], base_tone: str = "professional", usage=None,
+                     agents: Optional[List[Optional[str]]] = None,
+                     turns: Optional[List[Optional[int]]] = None) -> List[str]:
+        raise NotImplementedError
+
+
+class LLMToneBackend(ToneBackend):
+    """Ask the chat model for a one-word emotion (detect_conversation_tone), one call per message."""
+
+    name = "llm"
+
+    def detect(self, message, base_tone="professional", usage=None, agent=None, turn=None):
+        from .utils import nodes
+        return nodes.detect_conversation_tone(message, base_tone, usage, agent, turn, self.policies)
+
+    def detect_batch(self, messages, base_tone="professional", usage=None, agents=None, turns=None):
+        agents = agents or [None] * len(messages)
+        turns = turns or [None] * len(messages)
+        return [self.detect(message, base_tone, usage, agent, turn) for message, agent, turn in zip(messages, agents, turns)]
+
+
+class LexiconToneBackend(ToneBackend):
+    """Offline classifier: bag-of-words scored against an emotion lexicon with NumPy.
+
+    Every lexicon word maps to a row of a (n_words x n_emotions) weight matrix: 1.0 for
+    emotion words, ``cue_weight`` for discourse cues. A batch of messages is scored in one
+    pass by scattering the weight rows of its known tokens into a (n_messages x n_emotions)
+    matrix; unknown tokens are skipped. Messages with no lexicon hit, or whose top score is
+    shared by several emotions, get DEFAULT_EMOTION.
+    """
+
+    name = "lexicon"
+    supports_batch = True
+
+    def __init__(self, lexicon: Optional[dict] = None, cues: Optional[dict] = None, cue_weight: float = CUE_WEIGHT,
+                 policies: Optional[dict] = None):
+        super().__init__(policies)
+        lexicon = EMOTION_LEXICON if lexicon is None else lexicon
+        cues = TONE_CUES if cues is None else cues
+        self.emotions = list(dict.fromkeys([*lexicon, *cues]))
+        columns = {emotion: column for column, emotion in enumerate(self.emotions)}
+        self.vocabulary = {}
+        entries = []
+        for words_by_emotion, weight in ((lexicon, 1.0), (cues, cue_weight)):
+            for emotion, words in words_by_emotion.items():
+                for word in set(words):
+                    entries.append((self.vocabulary.setdefault(word, len(self.vocabulary)), columns[emotion], weight))
+        self.weights = np.zeros((len(self.vocabulary), len(self.emotions)), dtype=np.float32)
+        for row, column, weight in entries:
+            self.weights[row, column] += weight
+
+    def detect_batch(self, messages, base_tone="professional", usage=None, agents=None, turns=None):
+        if not messages:
+            return []
+        rows = []
+        indices = []
+        for row, message in enumerate(messages):
+            for token in _TOKEN_PATTERN.findall(message.lower()):
+                index = self.vocabulary.get(token)
+                if index is not None:
+                    rows.append(row)
+                    indices.append(index)
+
+        scores = np.zeros((len(messages), len(self.emotions)), dtype=np.float32)
+        if indices:
+            np.add.at(scores, np.asarray(rows), self.weights[np.asarray(indices)])
+
+        best = scores.argmax(axis=1)
+        top = scores.max(axis=1)
+        # argmax would break ties by dict order; a tie means no clear emotion
+        unique = (scores == top[:, None]).sum(axis=1) == 1
+        return [self.emotions[column] if hit else DEFAULT_EMOTION for column, hit in zip(best, (top > 0) & unique)]
+
+
+TONE_BACKENDS = {
+    LLMToneBackend.name: LLMToneBackend,
+    LexiconToneBackend.name: LexiconToneBackend,
+}
+
+def register_tone_backend(name: str, backend_cls):
+    """Make a ToneBackend subclass selectable with `tone_backend: <name>` in the config."""
+    TONE_BACKENDS[name] = backend_cls
+
+
+def create_tone_backend(name: str = "llm", policies: Optional[dict] = None) -> ToneBackend:
+    """Create an instance of the named tone backend using the given call policies."""
+    if name not in TONE_BACKENDS:
+        raise ValueError(f"Unknown tone_backend '{name}'. Available: {', '.join(TONE_BACKENDS)}")
+    return TONE_BACKENDS[name](policies=policies)
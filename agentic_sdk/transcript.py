@@ -5,7 +5,23 @@ def save_transcript(messages, path="outputs/transcript.json"):
     # Create the directory structure
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w") as f:
-        json.dump(messages, f, indent=2)
+        # Stream one message at a time (same layout as json.dump(indent=2)) so that
+        # disk-backed histories are never materialised as a single list
+        f.write("[")
+        empty = True
+        for msg in messages:
+            f.write("\n  " if empty else ",\n  ")
+            f.write(json.dumps(msg))
+            empty = False
+        f.write("]" if empty else "\n]")
+
+
+def save_usage_report(usage, path="outputs/usage.json"):
+    """Save a UsageTracker summary (tokens, latency and cost per stage, agent, turn and model)."""
+    # Create the directory structure
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(usage, f, indent=2)
 
 
 def save_text_transcript(messages, path="outputs/transcript.txt"):
@@ -0,0 +1,99 @@
+import threading
+from typing import Dict, Optional
+
+# USD per 1M tokens, keyed by model name (dated variants such as
+# "gpt-4o-mini-2024-07-18" match by prefix). Override via the `pricing` config field.
+DEFAULT_PRICING = {
+    "gpt-4o-mini": {"prompt": 0.15, "completion": 0.60},
+    "gpt-3.5-turbo": {"prompt": 0.50, "completion": 1.50},
+}
+
+
+def _empty_bucket() -> dict:
+    return {
+        "calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "latency_seconds": 0.0,
+        "cost_usd": 0.0,
+    }
+
+
+class UsageTracker:
+    """Aggregate token usage, latency and cost of model calls.
+
+    Calls are folded into running totals per stage (generation, emotion, evaluation),
+    per agent, per turn and per model as they are recorded, so memory stays proportional
+    to the number of turns rather than the number of calls.
+    """
+
+    def __init__(self, pricing: Optional[Dict[str, Dict[str, float]]] = None):
+        self.pricing = {**DEFAULT_PRICING, **(pricing or {})}
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._totals = _empty_bucket()
+            self._by_stage = {}
+            self._by_agent = {}
+            self._by_turn = {}
+            self._by_model = {}
+
+    def price(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """Cost in USD of a call, or 0.0 if the model has no entry in the price table."""
+        rates = self.pricing.get(model)
+        if rates is None:
+            matches = [name for name in self.pricing if model and model.startswith(name)]
+            rates = self.pricing[max(matches, key=len)] if matches else None
+        if rates is None:
+            return 0.0
+        return (prompt_tokens * rates.get("prompt", 0.0) + completion_tokens * rates.get("completion", 0.0)) / 1_000_000
+
+    def record(self, stage: str, model: str, prompt_tokens: int = 0, completion_tokens: int = 0,
+               latency: float = 0.0, agent: Optional[str] = None, turn: Optional[int] = None):
+        """Record a single model call."""
+        cost = self.price(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            buckets = [
+                self._totals,
+                self._by_stage.setdefault(stage, _empty_bucket()),
+                self._by_model.setdefault(model or "unknown", _empty_bucket()),
+            ]
+            if agent is not None:
+                buckets.append(self._by_agent.setdefault(agent, _empty_bucket()))
+            if turn is not None:
+                buckets.append(self._by_turn.setdefault(turn, _empty_bucket()))
+            for bucket in buckets:
+                bucket["calls"] += 1
+                bucket["prompt_tokens"] += prompt_tokens
+                bucket["completion_tokens"] += completion_tokens
+                bucket["total_tokens"] += prompt_tokens + completion_tokens
+                bucket["latency_seconds"] += latency
+                bucket["cost_usd"] += cost
+
+    def record_response(self, response, stage: str, latency: float, default_model: Optional[str] = None,
+                        agent: Optional[str] = None, turn: Optional[int] = None):
+        """Record a LangChain chat response, reading token counts from its usage metadata."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        metadata = getattr(response, "response_metadata", None) or {}
+        self.record(
+            stage,
+            metadata.get("model_name") or default_model,
+            prompt_tokens=usage.get("input_tokens", 0),
+            completion_tokens=usage.get("output_tokens", 0),
+            latency=latency,
+            agent=agent,
+            turn=turn,
+        )
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "totals": dict(self._totals),
+                "by_stage": {name: dict(bucket) for name, bucket in self._by_stage.items()},
+                "by_agent": {name: dict(bucket) for name, bucket in self._by_agent.items()},
+                "by_turn": {turn: dict(bucket) for turn, bucket in sorted(self._by_turn.items())},
+                "by_model": {name: dict(bucket) for name, bucket in self._by_model.items()},
+            }
@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, wait
+from typing import Callable, Optional
+
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+from .logger import logger
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call does not finish within its deadline on any attempt."""
+
+
+class CallExecutor:
+    """Thread pool for deadline-bound calls, shared by the CallPolicy objects of one simulator.
+
+    Submitted calls run with a copy of the caller's contextvars, so LangChain/LangGraph run
+    config and callbacks inherited on the node thread still apply. Python threads cannot be
+    interrupted, so a call that misses its deadline or loses a hedge race is abandoned and
+    finishes in the background, holding its worker. New attempts and hedges are only started
+    while a worker is free for them, so calls never wait in the pool's queue; when abandoned
+    calls hold every worker, further attempts fail fast with DeadlineExceeded.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        if max_workers < 2:
+            raise ValueError("call_max_workers must be at least 2")
+        self._pool = ContextThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agentic-sdk-call")
+        self.max_workers = max_workers
+        self._abandoned = 0
+        self._lock = threading.Lock()
+
+    @property
+    def abandoned(self) -> int:
+        with self._lock:
+            return self._abandoned
+
+    def has_capacity(self, workers: int = 1) -> bool:
+        """Whether ``workers`` more calls can start now, next to the abandoned ones still running."""
+        return self.abandoned + workers <= self.max_workers
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def abandon(self, future):
+        """Cancel a call that is no longer needed, or track it until it finishes if already running."""
+        if future.cancel() or future.done():
+            return
+        with self._lock:
+            self._abandoned += 1
+        future.add_done_callback(self._release)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future):
+        with self._lock:
+            self._abandoned -= 1
+
+
+class CallPolicy:
+    """Deadline, retry and hedging settings for one kind of remote call.
+
+    Each attempt must finish within ``timeout`` seconds of starting to run (time spent
+    waiting for a worker does not count) and is retried up to ``retries`` times on timeout;
+    other exceptions propagate unchanged. With ``hedge_percentile`` set, a duplicate request
+    is sent once an attempt has run longer than that percentile of recently observed
+    latencies; the first successful response wins and the other is cancelled or abandoned.
+
+    Abandoned attempts keep running, so callers that account for them (e.g. token usage)
+    should do so inside ``fn``; it runs to completion for every attempt started.
+    """
+
+    def __init__(self, name: str, timeout: Optional[float] = None, retries: int = 1,
+                 hedge_percentile: Optional[float] = None, executor: Optional[CallExecutor] = None,
+                 min_samples: int = 10, window: int = 200):
+        if hedge_percentile is not None and not 0 < hedge_percentile < 100:
+            raise ValueError("hedge_percentile must be between 0 and 100")
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self._executor = executor
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.timeouts = 0
+        self.hedges = 0
+
+    @property
+    def executor(self) -> CallExecutor:
+        if self._executor is None:
+            self._executor = CallExecutor()
+        return self._executor
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None until enough latencies have been observed."""
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[int(round(self.hedge_percentile / 100 * (len(ordered) - 1)))]
+
+    def call(self, fn: Callable, *args, **kwargs):
+        if self.timeout is None and self.hedge_percentile is None:
+            start = time.monotonic()
+            result = fn(*args, **kwargs)
+            self._observe(time.monotonic() - start)
+            return result
+
+        attempts = 0
+        for attempt in range(self.retries + 1):
+            if not self.executor.has_capacity():
+                logger.warning(f"{self.name} call not attempted: {self.executor.abandoned} abandoned calls hold every worker")
+                break
+            attempts += 1
+            try:
+                return self._attempt(fn, *args, **kwargs)
+            except DeadlineExceeded:
+                self.timeouts += 1
+                logger.warning(f"{self.name} call exceeded {self.timeout}s deadline (attempt {attempt + 1}/{self.retries + 1})")
+        raise DeadlineExceeded(f"{self.name} call exceeded {self.timeout}s deadline after {attempts} attempt(s)")
+
+    def stats(self) -> dict:
+        return {"timeouts": self.timeouts, "hedges": self.hedges, "hedge_delay": self.hedge_delay()}
+
+    def _observe(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _submit(self, fn: Callable, *args, **kwargs):
+        """Submit fn and return (future, started event, holder of its start time).
+
+        The event is set when fn starts running, or when the future is cancelled before that
+        (e.g. by CallExecutor.shutdown()), so waiting on it never blocks forever.
+        """
+        started = threading.Event()
+        holder = {}
+
+        def run():
+            holder["start"] = time.monotonic()
+            started.set()
+            return fn(*args, **kwargs)
+
+        future = self.executor.submit(run)
+        future.add_done_callback(lambda _: started.set())
+        return future, started, holder
+
+    def _attempt(self, fn: Callable, *args, **kwargs):
+        primary, started, holder = self._submit(fn, *args, **kwargs)
+        started.wait()
+        if "start" not in holder:
+            raise CancelledError(f"{self.name} call cancelled before it started (executor shut down)")
+        start = holder["start"]
+        deadline = None if self.timeout is None else start + self.timeout
+        pending = {primary}
+
+        delay = self.hedge_delay()
+        if delay is not None and (self.timeout is None or delay < self.timeout):
+            done, _ = wait(pending, timeout=max(0.0, start + delay - time.monotonic()))
+            # The primary holds one worker; the hedge needs another
+            if not done and self.executor.has_capacity(2):
+                self.hedges += 1
+                logger.info(f"{self.name} call slower than p{self.hedge_percentile:g} ({delay:.2f}s), sending hedged request")
+                pending.add(self._submit(fn, *args, **kwargs)[0])
+
+        error = None
+        while pending:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.cancelled():
+                    error = CancelledError(f"{self.name} call cancelled (executor shut down)")
+                elif future.exception() is None:
+                    for other in pending:
+                        self.executor.abandon(other)
+                    self._observe(time.monotonic() - start)
+                    return future.result()
+                else:
+                    error = future.exception()
+
+        for future in pending:
+            self.executor.abandon(future)
+        if error is not None and not pending:
+            raise error
+        raise DeadlineExceeded(f"{self.name} call exceeded {self.timeout}s deadline")
+
+
+def call_with_policy(policy: Optional[CallPolicy], fn: Callable, *args, **kwargs):
+    """Run fn under the given policy, or directly when there is none."""
+    if policy is None:
+        return fn(*args, **kwargs)
+    return policy.call(fn, *args, **kwargs)
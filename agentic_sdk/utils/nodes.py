@@ -1,6 +1,11 @@
 import os
+import time
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, Field
 from .logger import logger
+from .deadlines import DeadlineExceeded, call_with_policy
+from ..tone import DEFAULT_EMOTION, create_tone_backend
 from dotenv import load_dotenv
 from fi.evals import Evaluator, evaluate
 
@@ -16,10 +21,40 @@ if not api_key:
 llm1 = ChatOpenAI(model="gpt-4o-mini", api_key=api_key)
 llm2 = ChatOpenAI(model="gpt-3.5-turbo", api_key=api_key)
 
+
+class AgentTurn(BaseModel):
+    """Structured output used when the reply and its emotion label come from one call."""
+    reply: str = Field(description="The response itself, without any name or agent prefix")
+    emotion: str = Field(description="ONE specific, descriptive word for the emotion the response conveys")
+
+
+# with_structured_output() wrappers for llm1 and llm2: name -> (chat model, wrapper).
+# Other models get a fresh wrapper per call, so the cache never grows beyond two entries.
+_structured_llms = {}
+
+def invoke_llm(llm, prompt, usage=None, stage="generation", agent=None, turn=None, policy=None):
+    """
+    Invoke a chat model and, if a UsageTracker is given, record its tokens, model and latency.
+    With a CallPolicy the call is bound by its deadline, retries and hedging.
+    """
+    def attempt():
+        # Recorded inside the attempt so that hedged and abandoned requests, which the
+        # provider still bills, are counted when they complete
+        start = time.perf_counter()
+        response = llm.invoke(prompt)
+        if usage is not None:
+            usage.record_response(response, stage, time.perf_counter() - start,
+                                  default_model=getattr(llm, "model_name", None), agent=agent, turn=turn)
+        return response
+    
+    return call_with_policy(policy, attempt)
+
 # FutureAGI Evaluation Integration
-def evaluate_with_futureagi(message: str, evaluation_type: str = "tone") -> dict:
+def evaluate_with_futureagi(message: str, evaluation_type: str = "tone", usage=None, agent=None, turn=None, policy=None) -> dict:
     """
-    Evaluate message using FutureAGI evaluation SDK if available
+    Evaluate message using FutureAGI evaluation SDK if available.
+    Each evaluator call is recorded in ``usage`` (stage "evaluation") when given.
+    If the call misses the ``policy`` deadline, the evaluation is skipped.
     """
     try:
         logger.info(f"🔍 FutureAGI: Attempting to import evaluation SDK...")
@@ -57,17 +92,30 @@ def evaluate_with_futureagi(message: str, evaluation_type: str = "tone") -> dict
         
         template_name = template_mapping.get(evaluation_type, evaluation_type)
         
+        def attempt(**kwargs):
+            # Recorded inside the attempt so abandoned evaluator calls are counted too
+            start = time.perf_counter()
+            try:
+                return evaluator.evaluate(**kwargs)
+            finally:
+                if usage is not None:
+                    usage.record("evaluation", kwargs["model_name"], latency=time.perf_counter() - start, agent=agent, turn=turn)
+        
         for model_name in models_to_try:
             try:
                 logger.info(f"   Trying model: {model_name}")
                 if template_name in ["conversation_coherence", "conversation_resolution"]:
-                    result = evaluator.evaluate(
+                    result = call_with_policy(
+                        policy,
+                        attempt,
                         eval_templates=template_name,
                         inputs={"output": message},
                         model_name=model_name
                     )
                 else:
-                    result = evaluator.evaluate(
+                    result = call_with_policy(
+                        policy,
+                        attempt,
                         eval_templates=template_name,
                         inputs={"input": message},
                         model_name=model_name
@@ -86,6 +134,9 @@ def evaluate_with_futureagi(message: str, evaluation_type: str = "tone") -> dict
                     logger.warning(f" FutureAGI: No results from {model_name}")
                     continue
                     
+            except DeadlineExceeded as e:
+                logger.warning(f" FutureAGI: {e}, skipping evaluation")
+                return {"success": False, "error": f"Evaluation skipped: {e}"}
             except Exception as model_error:
                 logger.warning(f" FutureAGI: Model {model_name} failed: {model_error}")
                 continue
@@ -101,11 +152,14 @@ def evaluate_with_futureagi(message: str, evaluation_type: str = "tone") -> dict
         return {"success": False, "error": str(e)}
 
 
-def detect_conversation_tone(message_content, base_tone="professional"):
+def detect_conversation_tone(message_content, base_tone="professional", usage=None, agent=None, turn=None, policies=None):
     """
     Dynamically detect the emotion based on conversation content using AI analysis.
     Uses OpenAI as primary (superior) emotion detector, with FutureAGI as secondary analysis.
+    Model calls are recorded in ``usage`` (stages "emotion" and "evaluation") when given.
+    ``policies`` maps stage name to CallPolicy; a missed deadline yields DEFAULT_EMOTION.
     """
+    policies = policies or {}
     try:
         emotion_prompt = f"""Analyze the emotional tone and mood of this message. Think about how the speaker feels based on their words, tone, and content.
 
@@ -115,35 +169,104 @@ Message: "{message_content}"
 
 What emotion does this speaker convey? Respond with just ONE word:"""
         
-        emotion_response = llm1.invoke(emotion_prompt)
-        detected_emotion = emotion_response.content.strip().lower() if hasattr(emotion_response, 'content') else str(emotion_response).strip().lower()
-        
-        detected_emotion = detected_emotion.replace('"', '').replace("'", '').replace('.', '').strip()
-        
-        if ' ' in detected_emotion:
-            detected_emotion = detected_emotion.split()[0]
-        
-        if len(detected_emotion) > 20 or not detected_emotion.isalpha() or len(detected_emotion) < 3:
-            logger.warning(f"Invalid emotion word received: '{detected_emotion}', using thoughtful as default")
-            detected_emotion = 'thoughtful'
+        emotion_response = invoke_llm(llm1, emotion_prompt, usage, "emotion", agent, turn, policies.get("emotion"))
+        raw_emotion = emotion_response.content if hasattr(emotion_response, 'content') else str(emotion_response)
+        detected_emotion = normalize_emotion(raw_emotion)
         
         logger.info(f" OpenAI detected emotion: {detected_emotion}")
         
         # SECONDARY: Try FutureAGI for additional analysis (non-blocking)
-        try:
-            futureagi_result = evaluate_with_futureagi(message_content, "tone")
-            if futureagi_result.get("success"):
-                logger.info(f" FutureAGI Tone Analysis: {futureagi_result['evaluation']} (Reason: {futureagi_result['reason']})")
-            else:
-                logger.info(f" FutureAGI tone analysis not available: {futureagi_result.get('error', 'Unknown error')}")
-        except Exception as e:
-            logger.info(f" FutureAGI tone analysis failed: {e}")
+        futureagi_tone_analysis(message_content, usage, agent, turn, policies.get("evaluation"))
         
         return detected_emotion
         
+    except DeadlineExceeded as e:
+        logger.warning(f"Emotion detection skipped ({e}), using {DEFAULT_EMOTION} as default")
+        return DEFAULT_EMOTION
     except Exception as e:
         logger.error(f"AI emotion detection failed: {e}")
-        return 'thoughtful'
+        return DEFAULT_EMOTION
+
+
+def normalize_emotion(raw_emotion):
+    """
+    Reduce a model's emotion answer to a single lowercase word, falling back to
+    DEFAULT_EMOTION when it is not a plausible emotion word.
+    """
+    detected_emotion = str(raw_emotion).strip().lower()
+    detected_emotion = detected_emotion.replace('"', '').replace("'", '').replace('.', '').strip()
+    
+    if ' ' in detected_emotion:
+        detected_emotion = detected_emotion.split()[0]
+    
+    if len(detected_emotion) > 20 or not detected_emotion.isalpha() or len(detected_emotion) < 3:
+        logger.warning(f"Invalid emotion word received: '{detected_emotion}', using {DEFAULT_EMOTION} as default")
+        detected_emotion = DEFAULT_EMOTION
+    
+    return detected_emotion
+
+
+def futureagi_tone_analysis(message_content, usage=None, agent=None, turn=None, policy=None):
+    """
+    Log FutureAGI's tone evaluation of a message; failures never propagate.
+    """
+    try:
+        futureagi_result = evaluate_with_futureagi(message_content, "tone", usage, agent, turn, policy)
+        if futureagi_result.get("success"):
+            logger.info(f" FutureAGI Tone Analysis: {futureagi_result['evaluation']} (Reason: {futureagi_result['reason']})")
+        else:
+            logger.info(f" FutureAGI tone analysis not available: {futureagi_result.get('error', 'Unknown error')}")
+    except Exception as e:
+        logger.info(f" FutureAGI tone analysis failed: {e}")
+
+
+def _structured_llm(llm):
+    """Return the AgentTurn structured-output wrapper for a chat model, cached for llm1 and llm2."""
+    name = "llm1" if llm is llm1 else "llm2" if llm is llm2 else None
+    cached = _structured_llms.get(name)
+    if cached is not None and cached[0] is llm:
+        return cached[1]
+    # Function calling works for every OpenAI chat model, including gpt-3.5-turbo
+    structured_llm = llm.with_structured_output(AgentTurn, method="function_calling", include_raw=True)
+    if name is not None:
+        _structured_llms[name] = (llm, structured_llm)
+    return structured_llm
+
+
+def generate_reply_with_emotion(llm, prompt, usage=None, agent=None, turn=None, policy=None):
+    """
+    Generate a reply and its emotion label in a single structured-output call.
+    Returns (reply_text, emotion). If the output does not match the AgentTurn schema,
+    the raw reply is kept and the emotion falls back to DEFAULT_EMOTION.
+    """
+    structured_llm = _structured_llm(llm)
+    
+    def attempt():
+        # Recorded inside the attempt so hedged and abandoned requests are counted too
+        start = time.perf_counter()
+        result = structured_llm.invoke(prompt)
+        if usage is not None and result.get("raw") is not None:
+            usage.record_response(result["raw"], "generation", time.perf_counter() - start,
+                                  default_model=getattr(llm, "model_name", None), agent=agent, turn=turn)
+        return result
+    
+    result = call_with_policy(policy, attempt)
+    raw = result.get("raw")
+    
+    parsed = result.get("parsed")
+    if parsed is not None:
+        return clean_agent_response(parsed.reply), normalize_emotion(parsed.emotion)
+    
+    logger.warning(f"Structured reply did not match schema ({result.get('parsing_error')}), using {DEFAULT_EMOTION} as default emotion")
+    tool_calls = getattr(raw, "tool_calls", None) or []
+    reply_text = tool_calls[0].get("args", {}).get("reply") if tool_calls else None
+    if not reply_text:
+        reply_text = getattr(raw, "content", "") or ""
+    if not reply_text:
+        # Nothing usable came back: fall back to a plain generation call
+        response = invoke_llm(llm, prompt, usage, "generation", agent, turn, policy)
+        reply_text = response.content if hasattr(response, 'content') else str(response)
+    return clean_agent_response(reply_text), DEFAULT_EMOTION
 
 
 def clean_agent_response(response_text):
@@ -164,12 +287,17 @@ def clean_agent_response(response_text):
     return response_text.strip()
         
    
-def agent_a_node(state):
+def agent_a_node(state, config: RunnableConfig):
     """
-    Agent A conversation node with FutureAGI observability integration
+    Agent A conversation node with FutureAGI observability integration.
+    Returns only the state delta: the new message (appended by the reducer), turn and next speaker.
     """
-    session_id = state.config.get('session_id', f"session_{id(state)}")
-    conversation_id = state.config.get('conversation_id', f"conv_{state.config.get('topic', 'general').replace(' ', '_')}")
+    conversation = config["configurable"]["conversation"]
+    usage = config["configurable"].get("usage")  # Optional UsageTracker
+    policies = config["configurable"].get("call_policies") or {}  # Stage name -> CallPolicy
+    turn = state.turn + 1
+    session_id = conversation.get('session_id', f"session_{id(conversation)}")
+    conversation_id = conversation.get('conversation_id', f"conv_{conversation.get('topic', 'general').replace(' ', '_')}")
     
     if FUTURE_AGI_ENABLED:
         logger.info(f" FutureAGI Session: {session_id}, Conversation: {conversation_id}")
@@ -177,20 +305,20 @@ def agent_a_node(state):
     is_first_message = len(state.messages) == 0
     
     if is_first_message:
-        last_msg = f"Hello, let's discuss {state.config['topic']}."
-        logger.info(f" Agent A initiating conversation about: {state.config['topic']}")
+        last_msg = f"Hello, let's discuss {conversation['topic']}."
+        logger.info(f" Agent A initiating conversation about: {conversation['topic']}")
     else:
-        last_msg = state.messages[-1] if state.messages else f"Hello, let's discuss {state.config['topic']}."
+        last_msg = state.messages[-1] if state.messages else f"Hello, let's discuss {conversation['topic']}."
         logger.info(f" Agent A received: {last_msg[:100]}...")
 
-    agent_a_persona = state.config.get('agent_a_persona', 'A professional discussant')
-    base_tone = state.config.get('tone', 'neutral')
+    agent_a_persona = conversation.get('agent_a_persona', 'A professional discussant')
+    base_tone = conversation.get('tone', 'neutral')
     
     prompt = (
         f"You are {agent_a_persona}. "
         f"Speak in a {base_tone} tone. "
-        f"Context: {state.config.get('conversation_context', '')} "
-        f"Topic: {state.config['topic']} "
+        f"Context: {conversation.get('conversation_context', '')} "
+        f"Topic: {conversation['topic']} "
         f"Previous message: {last_msg} "
         f"IMPORTANT: Do not start your response with your name or any agent identifier. "
         f"Just provide your direct response content without any prefixes."
@@ -198,25 +326,33 @@ def agent_a_node(state):
 
     logger.info(f" Agent A generating response (Turn {state.turn + 1})")
     
-    response = llm1.invoke(prompt)
-    response_text = response.content if hasattr(response, 'content') else str(response)
-    
-    response_text = clean_agent_response(response_text)
-    
-    logger.info(f" Agent A replied: {response_text[:100]}...")
+    if conversation.get('emotion_mode') == "combined":
+        # One call returns both the reply and its emotion label
+        response_text, detected_emotion = generate_reply_with_emotion(llm1, prompt, usage, "agent_a", turn, policies.get("generation"))
+        logger.info(f" Agent A replied: {response_text[:100]}...")
+        logger.info(f" Structured output emotion: {detected_emotion}")
+        futureagi_tone_analysis(response_text, usage, "agent_a", turn, policies.get("evaluation"))
+    else:
+        response = invoke_llm(llm1, prompt, usage, "generation", "agent_a", turn, policies.get("generation"))
+        response_text = response.content if hasattr(response, 'content') else str(response)
+        
+        response_text = clean_agent_response(response_text)
+        
+        logger.info(f" Agent A replied: {response_text[:100]}...")
 
-    logger.info(f"Detecting emotion for Agent A response...")
-    detected_emotion = detect_conversation_tone(response_text, base_tone)
+        logger.info(f"Detecting emotion for Agent A response...")
+        tone_backend = config["configurable"].get("tone_backend") or create_tone_backend(conversation.get('tone_backend', 'llm'), policies)
+        detected_emotion = tone_backend.detect(response_text, base_tone, usage, "agent_a", turn)
     
     # Evaluate conversation quality using FutureAGI if available
     if not is_first_message:
-        coherence_result = evaluate_with_futureagi(response_text, "coherence")
+        coherence_result = evaluate_with_futureagi(response_text, "coherence", usage, "agent_a", turn, policies.get("evaluation"))
         if coherence_result.get("success"):
             logger.info(f" FutureAGI Coherence: {coherence_result['evaluation']} (Reason: {coherence_result['reason']})")
         else:
             logger.info(f" FutureAGI coherence evaluation failed: {coherence_result.get('error', 'Unknown error')}")
         
-        resolution_result = evaluate_with_futureagi(response_text, "resolution")
+        resolution_result = evaluate_with_futureagi(response_text, "resolution", usage, "agent_a", turn, policies.get("evaluation"))
         if resolution_result.get("success"):
             logger.info(f"FutureAGI Resolution: {resolution_result['evaluation']} (Reason: {resolution_result['reason']})")
         else:
@@ -225,7 +361,6 @@ def agent_a_node(state):
         
     
     speaker_label = f"Agent A ({detected_emotion})"
-    state.messages.append(f"{speaker_label}: {response_text}")
     
     logger.info(f" Turn {state.turn + 1} completed:")
     logger.info(f"   Speaker: Agent A")
@@ -234,29 +369,35 @@ def agent_a_node(state):
     if FUTURE_AGI_ENABLED:
         logger.info(f"   Session: {session_id}")
     
-    state.speaker = "agent_b"
-    state.turn += 1
-    
-    return state
+    return {
+        "messages": [f"{speaker_label}: {response_text}"],
+        "turn": state.turn + 1,
+        "speaker": "agent_b",
+    }
 
-def agent_b_node(state):
+def agent_b_node(state, config: RunnableConfig):
     """
-    Agent B conversation node with FutureAGI observability integration
+    Agent B conversation node with FutureAGI observability integration.
+    Returns only the state delta: the new message (appended by the reducer), turn and next speaker.
     """
-    session_id = state.config.get('session_id', f"session_{id(state)}")
-    conversation_id = state.config.get('conversation_id', f"conv_{state.config.get('topic', 'general').replace(' ', '_')}")
+    conversation = config["configurable"]["conversation"]
+    usage = config["configurable"].get("usage")  # Optional UsageTracker
+    policies = config["configurable"].get("call_policies") or {}  # Stage name -> CallPolicy
+    turn = state.turn + 1
+    session_id = conversation.get('session_id', f"session_{id(conversation)}")
+    conversation_id = conversation.get('conversation_id', f"conv_{conversation.get('topic', 'general').replace(' ', '_')}")
     
     last_msg = state.messages[-1] if state.messages else "Hello"
     logger.info(f" Agent B received: {last_msg[:100]}...")
 
-    agent_b_persona = state.config.get('agent_b_persona', 'A professional respondent')
-    base_tone = state.config.get('tone', 'neutral')
+    agent_b_persona = conversation.get('agent_b_persona', 'A professional respondent')
+    base_tone = conversation.get('tone', 'neutral')
     
     prompt = (
         f"You are {agent_b_persona}. "
         f"Speak in a {base_tone} tone. "
-        f"Context: {state.config.get('conversation_context', '')} "
-        f"Topic: {state.config['topic']} "
+        f"Context: {conversation.get('conversation_context', '')} "
+        f"Topic: {conversation['topic']} "
         f"Respond to this message: {last_msg} "
         f"IMPORTANT: Do not start your response with your name or any agent identifier. "
         f"Just provide your direct response content without any prefixes."
@@ -264,30 +405,37 @@ def agent_b_node(state):
 
     logger.info(f" Agent B generating response (Turn {state.turn + 1})")
     
-    response = llm2.invoke(prompt)
-    response_text = response.content if hasattr(response, 'content') else str(response)
-    
-    response_text = clean_agent_response(response_text)
-    
-    logger.info(f" Agent B replied: {response_text[:100]}...")
+    if conversation.get('emotion_mode') == "combined":
+        # One call returns both the reply and its emotion label
+        response_text, detected_emotion = generate_reply_with_emotion(llm2, prompt, usage, "agent_b", turn, policies.get("generation"))
+        logger.info(f" Agent B replied: {response_text[:100]}...")
+        logger.info(f" Structured output emotion: {detected_emotion}")
+        futureagi_tone_analysis(response_text, usage, "agent_b", turn, policies.get("evaluation"))
+    else:
+        response = invoke_llm(llm2, prompt, usage, "generation", "agent_b", turn, policies.get("generation"))
+        response_text = response.content if hasattr(response, 'content') else str(response)
+        
+        response_text = clean_agent_response(response_text)
+        
+        logger.info(f" Agent B replied: {response_text[:100]}...")
 
-    logger.info(f"Detecting emotion for Agent B response...")
-    detected_emotion = detect_conversation_tone(response_text, base_tone)
+        logger.info(f"Detecting emotion for Agent B response...")
+        tone_backend = config["configurable"].get("tone_backend") or create_tone_backend(conversation.get('tone_backend', 'llm'), policies)
+        detected_emotion = tone_backend.detect(response_text, base_tone, usage, "agent_b", turn)
     
-    coherence_result = evaluate_with_futureagi(response_text, "coherence")
+    coherence_result = evaluate_with_futureagi(response_text, "coherence", usage, "agent_b", turn, policies.get("evaluation"))
     if coherence_result.get("success"):
         logger.info(f" FutureAGI Coherence: {coherence_result['evaluation']} (Reason: {coherence_result['reason']})")
     else:
         logger.info(f" FutureAGI coherence evaluation failed: {coherence_result.get('error', 'Unknown error')}")
     
-    resolution_result = evaluate_with_futureagi(response_text, "resolution")
+    resolution_result = evaluate_with_futureagi(response_text, "resolution", usage, "agent_b", turn, policies.get("evaluation"))
     if resolution_result.get("success"):
         logger.info(f" FutureAGI Resolution: {resolution_result['evaluation']} (Reason: {resolution_result['reason']})")
     else:
         logger.info(f" FutureAGI resolution evaluation failed: {resolution_result.get('error', 'Unknown error')}")
     
     speaker_label = f"Agent B ({detected_emotion})"
-    state.messages.append(f"{speaker_label}: {response_text}")
     
     # Enhanced logging for FutureAGI observability
     logger.info(f" Turn {state.turn + 1} completed:")
@@ -297,7 +445,8 @@ def agent_b_node(state):
     if FUTURE_AGI_ENABLED:
         logger.info(f"   Session: {session_id}")
     
-    state.speaker = "agent_a"
-    state.turn += 1
-    
-    return state
\ No newline at end of file
+    return {
+        "messages": [f"{speaker_label}: {response_text}"],
+        "turn": state.turn + 1,
+        "speaker": "agent_a",
+    }
\ No newline at end of file
@@ -0,0 +1,11 @@
+import os
+
+from agentic_sdk.audio import merge_audio_clips
+
+
+def bench_merge_audio_clips(benchmark, wav_clips, tmp_path):
+    output_path = str(tmp_path / "conversation.wav")
+
+    result = benchmark.pedantic(merge_audio_clips, args=(wav_clips, output_path), rounds=5)
+    assert result == output_path
+    assert os.path.getsize(output_path) > 0
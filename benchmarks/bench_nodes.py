@@ -0,0 +1,68 @@
+from agentic_sdk.state import ConversationState
+from agentic_sdk.tone import LexiconToneBackend
+from agentic_sdk.utils.deadlines import CallPolicy
+from agentic_sdk.utils.nodes import clean_agent_response
+
+from conftest import SAMPLE_CONFIG
+
+
+def bench_clean_agent_response(benchmark, sample_responses):
+    def clean_all():
+        return [clean_agent_response(text) for text in sample_responses]
+
+    cleaned = benchmark(clean_all)
+    assert not any(text.startswith("Agent") for text in cleaned)
+
+
+def bench_clean_agent_response_long(benchmark, sample_responses):
+    text = "\n".join(sample_responses * 25)
+    cleaned = benchmark(clean_agent_response, text)
+    assert "\nAgent B:" not in cleaned
+
+
+def bench_lexicon_tone_batch(benchmark, sample_responses):
+    backend = LexiconToneBackend()
+    messages = [clean_agent_response(text) for text in sample_responses] * 1000
+
+    emotions = benchmark(backend.detect_batch, messages)
+    assert len(emotions) == len(messages)
+
+
+def _fresh_state(history_length, **conversation):
+    messages = [f"Agent {'A' if i % 2 == 0 else 'B'} (thoughtful): message {i}" for i in range(history_length)]
+    state = ConversationState(messages=messages, turn=history_length, max_turns=history_length + 2)
+    return (state, {"configurable": {"conversation": {**SAMPLE_CONFIG, **conversation}}}), {}
+
+
+def bench_agent_a_node(benchmark, offline_nodes):
+    update = benchmark.pedantic(
+        offline_nodes.agent_a_node,
+        setup=lambda: _fresh_state(200),
+        rounds=500,
+    )
+    assert update["speaker"] == "agent_b"
+
+
+def bench_agent_b_node(benchmark, offline_nodes):
+    update = benchmark.pedantic(
+        offline_nodes.agent_b_node,
+        setup=lambda: _fresh_state(200),
+        rounds=500,
+    )
+    assert update["speaker"] == "agent_a"
+
+
+def bench_agent_a_node_combined_emotion(benchmark, offline_nodes):
+    update = benchmark.pedantic(
+        offline_nodes.agent_a_node,
+        setup=lambda: _fresh_state(200, emotion_mode="combined"),
+        rounds=500,
+    )
+    assert update["messages"][0].startswith("Agent A (reflective):")
+
+
+def bench_call_policy_overhead(benchmark):
+    # Cost of running a call through the deadline/hedging executor instead of inline
+    policy = CallPolicy("generation", timeout=5.0, retries=1, hedge_percentile=95)
+
+    assert benchmark(policy.call, len, "response") == len("response")
@@ -0,0 +1,108 @@
+import time
+
+from agentic_sdk import AgentSimulator
+from agentic_sdk import agent as agent_module
+from agentic_sdk.events import EventBus
+from agentic_sdk.history import ConversationHistory
+from agentic_sdk.state import ConversationState
+
+
+def _history(length):
+    return [f"Agent {'A' if i % 2 == 0 else 'B'} (thoughtful): message number {i} about technology" for i in range(length)]
+
+
+def bench_state_construction(benchmark):
+    messages = _history(1000)
+    state = benchmark(ConversationState, messages=messages, turn=1000, max_turns=1000)
+    assert len(state.messages) == 1000
+
+
+def bench_state_copy(benchmark):
+    state = ConversationState(messages=_history(1000), turn=1000, max_turns=1000)
+    copied = benchmark(state.model_copy, deep=True)
+    assert copied.messages == state.messages
+
+
+def bench_state_roundtrip_from_dict(benchmark):
+    # Rebuilding the model from a plain dict, e.g. a serialized snapshot
+    data = ConversationState(messages=_history(1000), turn=1000, max_turns=1000).model_dump()
+    state = benchmark(lambda: ConversationState(**data))
+    assert state.turn == 1000
+
+
+def bench_history_spill_and_iterate(benchmark, tmp_path):
+    messages = _history(5000)
+
+    def fill_and_read():
+        history = ConversationHistory(window=50, store_path=str(tmp_path / "history.sqlite"))
+        history.extend(messages)
+        count = sum(1 for _ in history)
+        history.close()
+        return count
+
+    assert benchmark(fill_and_read) == len(messages)
+
+
+def bench_event_publish_with_slow_observer(benchmark):
+    # Publishing should cost a queue put, regardless of how slow the observer is
+    bus = EventBus(max_queue_size=100000, overflow_policy="drop")
+    bus.subscribe(lambda events: time.sleep(0.001), batched=True)
+
+    benchmark(bus.publish, "message_processed", {"turn": 1, "speaker": "Agent A (thoughtful)"})
+    bus.close()
+
+
+def bench_scripted_conversation(benchmark, offline_nodes, scripted_config):
+    sim = AgentSimulator()
+    sim.configure_from_dict(scripted_config)
+
+    state = benchmark(sim._run_scripted_conversation, False)
+    assert len(state.messages) == len(scripted_config.scripted_messages)
+
+
+def bench_scripted_conversation_lexicon_tone(benchmark, scripted_config):
+    sim = AgentSimulator()
+    sim.configure_from_dict(scripted_config.model_copy(update={"tone_backend": "lexicon"}))
+
+    state = benchmark(sim._run_scripted_conversation, False)
+    assert len(state.messages) == len(scripted_config.scripted_messages)
+
+
+def _noop_agent_a(state, config):
+    return {"messages": ["Agent A (thoughtful): ok"], "turn": state.turn + 1, "speaker": "agent_b"}
+
+
+def _noop_agent_b(state, config):
+    return {"messages": ["Agent B (thoughtful): ok"], "turn": state.turn + 1, "speaker": "agent_a"}
+
+
+def bench_graph_compile(benchmark, monkeypatch):
+    monkeypatch.setattr(agent_module, "agent_a_node", _noop_agent_a)
+    monkeypatch.setattr(agent_module, "agent_b_node", _noop_agent_b)
+
+    app = benchmark(agent_module._build_conversation_graph)
+    assert app is not None
+
+
+def bench_simulator_setup(benchmark, unscripted_config):
+    # The compiled graph is shared, so configuring another simulator should not recompile it
+    def configure():
+        sim = AgentSimulator()
+        sim.configure_from_dict(unscripted_config)
+        return sim
+
+    sim = benchmark(configure)
+    assert sim.app is agent_module._get_conversation_graph()
+
+
+def bench_graph_step_overhead(benchmark, monkeypatch, unscripted_config):
+    monkeypatch.setattr(agent_module, "agent_a_node", _noop_agent_a)
+    monkeypatch.setattr(agent_module, "agent_b_node", _noop_agent_b)
+    app = agent_module._build_conversation_graph()
+    runtime_config = {"configurable": {"conversation": unscripted_config.dict()}, "recursion_limit": 60}
+
+    def run_graph():
+        return app.invoke({"messages": [], "turn": 0, "max_turns": 50, "speaker": "agent_a"}, config=runtime_config)
+
+    final_state = benchmark(run_graph)
+    assert final_state["turn"] == 50
@@ -0,0 +1,145 @@
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+# The nodes module builds its ChatOpenAI clients at import time; no request is
+# ever sent from the benchmarks, so a placeholder key is enough.
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-placeholder")
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+# The SDK logger truncates outputs/logs/run.log relative to the working directory when the
+# package is first imported; import it from a scratch directory so the tracked log is left alone.
+_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix="agentic_sdk_bench_"))
+try:
+    import agentic_sdk  # noqa: F401
+finally:
+    os.chdir(_cwd)
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".baselines")
+
+from agentic_sdk.config import ConversationConfig, ConversationMode
+from agentic_sdk.utils import nodes
+
+
+# Realistic model outputs, including the agent-name prefixes that
+# clean_agent_response has to strip.
+SAMPLE_RESPONSES = [
+    "Agent A (thoughtful): That's an excellent question. When we talk about the societal "
+    "impact of automation, we have to separate short-term displacement from long-term "
+    "structural change in the labour market.",
+    "Agent B: I agree, although I would argue the distinction is less clear than it seems. "
+    "Historically, every wave of technology has reshaped which skills are valued.\n"
+    "Agent B (reflective): And the pace of this wave is unprecedented.",
+    "Agent A, I think the evidence points towards a gradual transition rather than a sudden "
+    "shock, provided that institutions adapt their education and welfare systems in time.",
+    "Certainly. Privacy is another dimension worth exploring: data collection at scale "
+    "creates asymmetries of power between platforms and individuals.\n"
+    "Agent A: Which is precisely why regulation matters.",
+]
+
+SAMPLE_CONFIG = {
+    "turns": 6,
+    "topic": "Technology and Society",
+    "tone": "formal",
+    "voices": ["voice1", "voice2"],
+    "tts_provider": "gtts",
+    "agent_a_persona": "A thoughtful technology researcher who explores the societal impacts of technological advancement",
+    "agent_b_persona": "An insightful social scientist who analyzes how technology shapes human behavior and social structures",
+    "conversation_context": "A professional discussion about the relationship between technology and society, focusing on both positive and negative impacts",
+}
+
+
+def pytest_configure(config):
+    # Resolve the baseline store from this file rather than the working directory, so
+    # `pytest benchmarks` from the root and `pytest` from inside benchmarks/ share it.
+    # An explicit --benchmark-storage still wins.
+    if config.getoption("benchmark_storage", None) == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{BASELINE_DIR}"
+
+
+class FakeLLM:
+    """Stand-in for ChatOpenAI that cycles through canned responses."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = 0
+
+    def invoke(self, prompt):
+        content = self.responses[self.calls % len(self.responses)]
+        self.calls += 1
+        return SimpleNamespace(content=content)
+
+    def with_structured_output(self, schema, **kwargs):
+        return FakeStructuredLLM(self, schema)
+
+
+class FakeStructuredLLM:
+    """Stand-in for with_structured_output(..., include_raw=True)."""
+
+    def __init__(self, llm, schema):
+        self.llm = llm
+        self.schema = schema
+
+    def invoke(self, prompt):
+        raw = self.llm.invoke(prompt)
+        return {"raw": raw, "parsed": self.schema(reply=raw.content, emotion="Reflective"), "parsing_error": None}
+
+
+@pytest.fixture
+def sample_responses():
+    return SAMPLE_RESPONSES
+
+
+@pytest.fixture
+def offline_nodes(monkeypatch):
+    """Replace every network call made by the agent nodes with an in-process stub."""
+    monkeypatch.setattr(nodes, "llm1", FakeLLM(SAMPLE_RESPONSES))
+    monkeypatch.setattr(nodes, "llm2", FakeLLM(SAMPLE_RESPONSES[::-1]))
+    monkeypatch.setattr(nodes, "detect_conversation_tone", lambda message, base_tone="professional", *args: "thoughtful")
+    monkeypatch.setattr(nodes, "futureagi_tone_analysis", lambda message_content, *args: None)
+    monkeypatch.setattr(nodes, "evaluate_with_futureagi", lambda message, evaluation_type="tone", *args: {"success": False, "error": "offline"})
+    return nodes
+
+
+@pytest.fixture
+def unscripted_config():
+    return ConversationConfig(**SAMPLE_CONFIG)
+
+
+@pytest.fixture
+def scripted_config():
+    lines = []
+    for i in range(500):
+        speaker = "Agent A" if i % 2 == 0 else "Agent B"
+        content = nodes.clean_agent_response(SAMPLE_RESPONSES[i % len(SAMPLE_RESPONSES)])
+        lines.append(f"{speaker}: {content}")
+    return ConversationConfig(
+        **{**SAMPLE_CONFIG, "turns": len(lines)},
+        mode=ConversationMode.SCRIPTED,
+        scripted_messages=lines,
+    )
+
+
+@pytest.fixture(scope="session")
+def wav_clips(tmp_path_factory):
+    """Four one-minute mono WAV clips (four minutes of audio in total)."""
+    folder = tmp_path_factory.mktemp("audio")
+    sample_rate = 24000
+    rng = np.random.default_rng(0)
+    t = np.arange(sample_rate * 60) / sample_rate
+    paths = []
+    for i in range(4):
+        tone = 0.3 * np.sin(2 * np.pi * (220 + 40 * i) * t)
+        noise = 0.01 * rng.standard_normal(t.shape[0])
+        path = str(folder / f"turn_{i + 1}.wav")
+        sf.write(path, tone + noise, sample_rate)
+        paths.append(path)
+    return paths
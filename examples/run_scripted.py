@@ -39,6 +39,8 @@ def main():
     
     # Run the conversation with observability
     sim.run(observe=True)
+    # Observers run on a background worker; wait for them to catch up before reporting
+    sim.flush_observers(timeout=10)
     
     # Show final metrics
     final_metrics = sim.get_metrics()
@@ -48,6 +50,9 @@ def main():
     sim.save_transcript()
     sim.generate_audio()
     
+    # Stop the observer worker and release the history store
+    sim.close(timeout=10)
+    
     print("\nScripted conversation completed!")
     print("Check outputs/scripted/transcript.txt for the conversation")
     print("Check outputs/scripted/conversation.wav for the audio")
@@ -38,6 +38,8 @@ def main():
     
     # Run the conversation with observability
     sim.run(observe=True)
+    # Observers run on a background worker; wait for them to catch up before reporting
+    sim.flush_observers(timeout=10)
     
     # Check final metrics
     final_metrics = sim.get_metrics()
@@ -47,6 +49,9 @@ def main():
     sim.save_transcript()
     sim.generate_audio()
     
+    # Stop the observer worker and release the history store
+    sim.close(timeout=10)
+    
     print("\nUnscripted conversation completed!")
     print(" Check outputs/unscripted/transcript.txt for the conversation")
     print(" Check outputs/unscripted/conversation.wav for the audio")
@@ -0,0 +1,19 @@
+import os
+import sys
+import tempfile
+
+# The nodes module builds its ChatOpenAI clients at import time; the tests never
+# send a request, so a placeholder key is enough.
+os.environ.setdefault("OPENAI_API_KEY", "sk-test-placeholder")
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+# The SDK logger truncates outputs/logs/run.log relative to the working directory when the
+# package is first imported; import it from a scratch directory so the tracked log is left alone.
+_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix="agentic_sdk_tests_"))
+try:
+    import agentic_sdk  # noqa: F401
+finally:
+    os.chdir(_cwd)
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+from agentic_sdk.usage import UsageTracker
+from agentic_sdk.utils import nodes
+
+
+def _raw(content="", tool_calls=None):
+    return SimpleNamespace(
+        content=content,
+        tool_calls=tool_calls or [],
+        usage_metadata={"input_tokens": 20, "output_tokens": 10},
+        response_metadata={"model_name": "gpt-4o-mini"},
+    )
+
+
+class StubStructuredLLM:
+    """Stand-in for with_structured_output(AgentTurn, include_raw=True) returning a fixed result."""
+
+    def __init__(self, result):
+        self.result = result
+
+    def invoke(self, prompt):
+        return self.result
+
+
+class StubLLM:
+    model_name = "gpt-4o-mini"
+
+    def __init__(self, result, plain_reply="Agent A: A plain reply."):
+        self.result = result
+        self.plain_reply = plain_reply
+        self.plain_calls = 0
+        self.wrappers_built = 0
+
+    def with_structured_output(self, schema, **kwargs):
+        self.wrappers_built += 1
+        return StubStructuredLLM(self.result)
+
+    def invoke(self, prompt):
+        self.plain_calls += 1
+        return _raw(self.plain_reply)
+
+
+def test_parsed_reply_and_emotion():
+    result = {"raw": _raw(), "parsed": nodes.AgentTurn(reply="Agent A: Fair point.", emotion="Hopeful."), "parsing_error": None}
+    usage = UsageTracker()
+
+    assert nodes.generate_reply_with_emotion(StubLLM(result), "prompt", usage) == ("Fair point.", "hopeful")
+    assert usage.summary()["by_stage"]["generation"]["calls"] == 1
+
+
+def test_schema_mismatch_uses_tool_call_reply():
+    raw = _raw(tool_calls=[{"name": "AgentTurn", "args": {"reply": "Agent A: From the tool call."}, "id": "call_1"}])
+    result = {"raw": raw, "parsed": None, "parsing_error": ValueError("emotion: field required")}
+    llm = StubLLM(result)
+
+    assert nodes.generate_reply_with_emotion(llm, "prompt") == ("From the tool call.", "thoughtful")
+    assert llm.plain_calls == 0
+
+
+def test_schema_mismatch_uses_raw_content():
+    result = {"raw": _raw("Agent A: From the message content."), "parsed": None, "parsing_error": ValueError("no tool call")}
+    llm = StubLLM(result)
+
+    assert nodes.generate_reply_with_emotion(llm, "prompt") == ("From the message content.", "thoughtful")
+    assert llm.plain_calls == 0
+
+
+def test_empty_response_falls_back_to_plain_call():
+    result = {"raw": _raw(), "parsed": None, "parsing_error": ValueError("empty response")}
+    llm = StubLLM(result)
+    usage = UsageTracker()
+
+    assert nodes.generate_reply_with_emotion(llm, "prompt", usage) == ("A plain reply.", "thoughtful")
+    assert llm.plain_calls == 1
+    assert usage.summary()["by_stage"]["generation"]["calls"] == 2
+
+
+def test_structured_wrappers_are_cached_only_for_module_models(monkeypatch):
+    result = {"raw": _raw(), "parsed": nodes.AgentTurn(reply="Ok.", emotion="calm"), "parsing_error": None}
+    agent_llm = StubLLM(result)
+    monkeypatch.setattr(nodes, "llm1", agent_llm)
+    monkeypatch.setattr(nodes, "_structured_llms", {})
+
+    for _ in range(3):
+        nodes.generate_reply_with_emotion(agent_llm, "prompt")
+    for _ in range(50):
+        nodes.generate_reply_with_emotion(StubLLM(result), "prompt")
+
+    assert agent_llm.wrappers_built == 1
+    assert list(nodes._structured_llms) == ["llm1"]
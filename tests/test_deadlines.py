@@ -0,0 +1,214 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import CancelledError
+from types import SimpleNamespace
+
+import pytest
+
+from agentic_sdk.usage import UsageTracker
+from agentic_sdk.utils import nodes
+from agentic_sdk.utils.deadlines import CallExecutor, CallPolicy, DeadlineExceeded
+
+
+class SlowLLM:
+    """Chat model stub whose calls take ``delays[i]`` seconds (the last delay repeats)."""
+
+    model_name = "gpt-4o-mini"
+
+    def __init__(self, delays, content="Agent A: A measured reply."):
+        self.delays = delays
+        self.content = content
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            delay = self.delays[min(self.calls, len(self.delays) - 1)]
+            self.calls += 1
+        time.sleep(delay)
+        return SimpleNamespace(
+            content=self.content,
+            usage_metadata={"input_tokens": 10, "output_tokens": 5},
+            response_metadata={"model_name": self.model_name},
+        )
+
+
+@pytest.fixture
+def executor():
+    executor = CallExecutor(max_workers=4)
+    yield executor
+    executor.shutdown()
+
+
+def warm(policy, latency=0.01, samples=10):
+    for _ in range(samples):
+        policy._observe(latency)
+
+
+def test_timeout_raises_after_retries(executor):
+    policy = CallPolicy("generation", timeout=0.05, retries=1, executor=executor)
+    llm = SlowLLM([0.3])
+
+    with pytest.raises(DeadlineExceeded, match="after 2 attempt"):
+        policy.call(llm.invoke, "prompt")
+    assert llm.calls == 2
+    assert policy.timeouts == 2
+
+
+def test_retry_after_timeout_succeeds(executor):
+    policy = CallPolicy("generation", timeout=0.1, retries=1, executor=executor)
+    llm = SlowLLM([0.3, 0.0])
+
+    assert policy.call(llm.invoke, "prompt").content == llm.content
+    assert llm.calls == 2
+    assert policy.timeouts == 1
+
+
+def test_hedge_wins_and_loser_usage_is_recorded(executor):
+    policy = CallPolicy("generation", timeout=1.0, hedge_percentile=50, executor=executor)
+    warm(policy)
+    llm = SlowLLM([0.3, 0.0])
+    usage = UsageTracker()
+
+    start = time.monotonic()
+    nodes.invoke_llm(llm, "prompt", usage, "generation", "agent_a", 1, policy)
+    assert time.monotonic() - start < 0.25
+    assert policy.hedges == 1
+    assert usage.summary()["totals"]["calls"] == 1
+
+    executor_idle = time.monotonic() + 1.0
+    while executor.abandoned and time.monotonic() < executor_idle:
+        time.sleep(0.01)
+    totals = usage.summary()["totals"]
+    assert totals["calls"] == 2
+    assert totals["total_tokens"] == 30
+
+
+def test_timed_out_attempt_usage_is_recorded(executor):
+    policy = CallPolicy("emotion", timeout=0.05, retries=0, executor=executor)
+    usage = UsageTracker()
+
+    with pytest.raises(DeadlineExceeded):
+        nodes.invoke_llm(SlowLLM([0.15]), "prompt", usage, "emotion", "agent_a", 1, policy)
+    time.sleep(0.2)
+    assert usage.summary()["by_stage"]["emotion"]["calls"] == 1
+
+
+def test_all_attempts_erroring_propagates_error(executor):
+    policy = CallPolicy("generation", timeout=1.0, hedge_percentile=50, executor=executor)
+    warm(policy)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.05)
+        raise ConnectionError("provider unavailable")
+
+    with pytest.raises(ConnectionError, match="provider unavailable"):
+        policy.call(failing)
+    assert len(calls) == 2
+    assert policy.timeouts == 0
+
+
+def test_deadline_starts_when_call_runs():
+    executor = CallExecutor(max_workers=2)
+    blocker = threading.Event()
+    try:
+        # Hold one worker so the pool is busy, then check a queued call is not charged for waiting
+        executor.submit(blocker.wait, 1.0)
+        policy = CallPolicy("generation", timeout=0.2, retries=0, executor=executor)
+        threading.Timer(0.3, blocker.set).start()
+        assert policy.call(lambda: "ok") == "ok"
+    finally:
+        blocker.set()
+        executor.shutdown()
+
+
+def test_abandoned_calls_are_bounded():
+    executor = CallExecutor(max_workers=2)
+    release = threading.Event()
+    try:
+        policy = CallPolicy("generation", timeout=0.02, retries=5, executor=executor)
+        with pytest.raises(DeadlineExceeded, match="after 2 attempt"):
+            policy.call(release.wait, 1.0)
+        assert executor.abandoned == 2
+        assert not executor.has_capacity()
+    finally:
+        release.set()
+    deadline = time.monotonic() + 1.0
+    while executor.abandoned and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert executor.has_capacity(2)
+    executor.shutdown()
+
+
+def test_contextvars_reach_the_call(executor):
+    request_id = contextvars.ContextVar("request_id", default=None)
+    request_id.set("turn-7")
+    policy = CallPolicy("generation", timeout=1.0, executor=executor)
+
+    assert policy.call(request_id.get) == "turn-7"
+
+
+def test_emotion_deadline_falls_back_to_default(monkeypatch, executor):
+    monkeypatch.setattr(nodes, "llm1", SlowLLM([0.3], content="Delighted"))
+    monkeypatch.setattr(nodes, "futureagi_tone_analysis", lambda *args: None)
+    policies = {"emotion": CallPolicy("emotion", timeout=0.05, retries=0, executor=executor)}
+
+    assert nodes.detect_conversation_tone("What a result!", "formal", policies=policies) == "thoughtful"
+
+
+def test_evaluation_deadline_skips_evaluation(monkeypatch, executor):
+    class SlowEvaluator:
+        def __init__(self, **kwargs):
+            pass
+
+        def evaluate(self, **kwargs):
+            time.sleep(0.3)
+
+    monkeypatch.setenv("FI_API_KEY", "fi-test")
+    monkeypatch.setenv("FI_SECRET_KEY", "fi-secret")
+    monkeypatch.setattr(nodes, "Evaluator", SlowEvaluator)
+    policy = CallPolicy("evaluation", timeout=0.05, retries=0, executor=executor)
+
+    result = nodes.evaluate_with_futureagi("A reply.", "coherence", policy=policy)
+    assert result["success"] is False
+    assert result["error"].startswith("Evaluation skipped")
+
+
+def test_generation_deadline_raises(monkeypatch, executor):
+    monkeypatch.setattr(nodes, "llm1", SlowLLM([0.3]))
+    state = SimpleNamespace(messages=[], turn=0)
+    config = {"configurable": {
+        "conversation": {"topic": "Technology", "tone": "formal"},
+        "call_policies": {"generation": CallPolicy("generation", timeout=0.05, retries=0, executor=executor)},
+    }}
+
+    with pytest.raises(DeadlineExceeded):
+        nodes.agent_a_node(state, config)
+
+
+def test_tone_backend_receives_policies_through_constructor():
+    from agentic_sdk.tone import create_tone_backend
+
+    policies = {"emotion": CallPolicy("emotion", timeout=1.0)}
+    assert create_tone_backend("llm", policies).policies is policies
+    assert create_tone_backend("lexicon", policies).policies is policies
+
+
+def test_node_fallback_tone_backend_uses_node_policies(monkeypatch, executor):
+    monkeypatch.setattr(nodes, "llm1", SlowLLM([0.0, 0.3]))
+    monkeypatch.setattr(nodes, "futureagi_tone_analysis", lambda *args: None)
+    monkeypatch.setattr(nodes, "evaluate_with_futureagi", lambda *args: {"success": False})
+    state = SimpleNamespace(messages=[], turn=0)
+    # No configurable["tone_backend"]: the node builds one from its own call policies
+    config = {"configurable": {
+        "conversation": {"topic": "Technology", "tone": "formal"},
+        "call_policies": {"emotion": CallPolicy("emotion", timeout=0.05, retries=0, executor=executor)},
+    }}
+
+    start = time.monotonic()
+    delta = nodes.agent_a_node(state, config)
+    assert time.monotonic() - start < 0.25
+    assert delta["messages"][0].startswith("Agent A (thoughtful):")
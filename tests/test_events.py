@@ -0,0 +1,30 @@
+import threading
+import time
+
+from agentic_sdk.events import EventBus
+
+
+def test_flush_and_close_honour_timeout():
+    release = threading.Event()
+    seen = []
+    bus = EventBus(max_queue_size=10)
+    bus.subscribe(lambda event_type, data: (release.wait(), seen.append(event_type)))
+    bus.publish("message_processed", {"turn": 1})
+
+    start = time.monotonic()
+    assert bus.flush(timeout=0.05) is False
+    bus.close(timeout=0.05)
+    assert time.monotonic() - start < 0.5
+    assert bus.stats()["queued"] == 0
+    release.set()
+
+
+def test_close_delivers_pending_events():
+    seen = []
+    bus = EventBus()
+    bus.subscribe(lambda event_type, data: seen.append(data["turn"]))
+    for turn in range(5):
+        bus.publish("message_processed", {"turn": turn})
+
+    bus.close(timeout=1.0)
+    assert seen == list(range(5))
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+from agentic_sdk import AgentSimulator
+from agentic_sdk import agent as agent_module
+from agentic_sdk.config import ConversationConfig
+from agentic_sdk.state import ConversationState
+from agentic_sdk.usage import UsageTracker
+from agentic_sdk.utils import nodes
+
+CONFIG = {
+    "turns": 4,
+    "topic": "Technology and Society",
+    "tone": "formal",
+    "voices": ["voice1", "voice2"],
+    "tts_provider": "gtts",
+}
+
+
+class StubLLM:
+    model_name = "gpt-4o-mini"
+
+    def invoke(self, prompt):
+        return SimpleNamespace(content="Agent A: A considered reply.", usage_metadata={}, response_metadata={})
+
+
+def test_graph_reads_configuration_from_runtime_config(monkeypatch):
+    seen = []
+
+    def noop_agent_a(state, config):
+        seen.append((set(state.model_dump()), config["configurable"]["conversation"]["topic"]))
+        return {"messages": ["Agent A (thoughtful): ok"], "turn": state.turn + 1, "speaker": "agent_b"}
+
+    def noop_agent_b(state, config):
+        seen.append((set(state.model_dump()), config["configurable"]["conversation"]["topic"]))
+        return {"messages": ["Agent B (thoughtful): ok"], "turn": state.turn + 1, "speaker": "agent_a"}
+
+    monkeypatch.setattr(agent_module, "agent_a_node", noop_agent_a)
+    monkeypatch.setattr(agent_module, "agent_b_node", noop_agent_b)
+    app = agent_module._build_conversation_graph()
+    runtime_config = {"configurable": {"conversation": CONFIG}, "recursion_limit": 10}
+
+    final_state = app.invoke({"messages": [], "turn": 0, "max_turns": 4, "speaker": "agent_a"}, config=runtime_config)
+    assert final_state["turn"] == 4
+    assert final_state["messages"] == ["Agent A (thoughtful): ok", "Agent B (thoughtful): ok"]
+    assert seen == [({"messages", "turn", "max_turns", "speaker"}, "Technology and Society")] * 4
+
+
+def test_nodes_return_only_the_state_delta(monkeypatch):
+    monkeypatch.setattr(nodes, "llm1", StubLLM())
+    monkeypatch.setattr(nodes, "futureagi_tone_analysis", lambda *args: None)
+    monkeypatch.setattr(nodes, "evaluate_with_futureagi", lambda *args: {"success": False})
+    state = ConversationState(messages=["Agent B (calm): Over to you."], turn=1, max_turns=4, speaker="agent_a")
+    config = {"configurable": {"conversation": {**CONFIG, "tone_backend": "lexicon"}, "usage": UsageTracker()}}
+
+    delta = nodes.agent_a_node(state, config)
+    assert set(delta) == {"messages", "turn", "speaker"}
+    assert delta["turn"] == 2
+    assert delta["speaker"] == "agent_b"
+    assert len(delta["messages"]) == 1
+
+
+def test_simulators_share_one_compiled_graph():
+    first = AgentSimulator(config=ConversationConfig(**CONFIG))
+    second = AgentSimulator(config=ConversationConfig(**{**CONFIG, "topic": "Climate"}))
+
+    assert first.app is second.app is agent_module._get_conversation_graph()
+    assert "config" not in first.state.model_dump()
+    first.close()
+    second.close()
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from agentic_sdk.history import READ_PAGE_SIZE, ConversationHistory
+
+
+def test_iterates_spilled_and_recent_messages_in_order(tmp_path):
+    history = ConversationHistory(window=4, store_path=str(tmp_path / "history.sqlite"))
+    messages = [f"message {i}" for i in range(2 * READ_PAGE_SIZE + 10)]
+    history.extend(messages)
+
+    assert history.memory_usage()["spilled_messages"] > READ_PAGE_SIZE
+    assert list(history) == messages
+    history.close()
+
+
+def test_use_after_close_raises():
+    history = ConversationHistory(window=2)
+    history.extend(f"message {i}" for i in range(100))
+    history.close()
+
+    assert len(history) == 100
+    with pytest.raises(ValueError, match="closed"):
+        list(history)
+    with pytest.raises(ValueError, match="closed"):
+        history.append("late message")
+    with pytest.raises(ValueError, match="closed"):
+        history.recent()
+
+
+def test_iterates_from_another_thread():
+    history = ConversationHistory(window=2)
+    messages = [f"message {i}" for i in range(200)]
+    history.extend(messages)
+    result = []
+
+    reader = threading.Thread(target=lambda: result.extend(history))
+    reader.start()
+    reader.join()
+    assert result == messages
+    history.close()
+
+
+def test_len_and_memory_usage_during_concurrent_appends():
+    history = ConversationHistory(window=8)
+    total = 20000
+    stop = threading.Event()
+    errors = []
+    lengths = []
+
+    def observe():
+        try:
+            while not stop.is_set():
+                lengths.append(len(history))
+                usage = history.memory_usage()
+                assert usage["in_memory_messages"] + usage["spilled_messages"] >= lengths[-1]
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=observe)
+    reader.start()
+    for i in range(total):
+        history.append(f"message {i}")
+    stop.set()
+    reader.join()
+
+    assert errors == []
+    assert lengths == sorted(lengths)
+    assert len(history) == total
+    history.close()
+
+
+def test_concurrent_spill_during_iteration():
+    history = ConversationHistory(window=2)
+    history.extend(f"message {i}" for i in range(2 * READ_PAGE_SIZE))
+    iterator = iter(history)
+    seen = [next(iterator)]
+    history.extend(f"message {i}" for i in range(2 * READ_PAGE_SIZE, 3 * READ_PAGE_SIZE))
+    seen.extend(iterator)
+
+    assert seen == [f"message {i}" for i in range(3 * READ_PAGE_SIZE)]
+    history.close()
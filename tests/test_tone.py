@@ -0,0 +1,72 @@
+import pytest
+
+from agentic_sdk.agent import AgentSimulator
+from agentic_sdk.config import ConversationConfig
+from agentic_sdk.tone import DEFAULT_EMOTION, TONE_BACKENDS, LexiconToneBackend, ToneBackend
+
+
+def test_lexicon_matches_exact_words_only():
+    backend = LexiconToneBackend({"concerned": ["risk"], "optimistic": ["hope"]}, cues={})
+
+    assert backend.detect_batch(["The risk is real", "We hope so", "Risky and hopeless"]) == [
+        "concerned", "optimistic", DEFAULT_EMOTION,
+    ]
+
+
+def test_lexicon_ignores_unknown_words():
+    backend = LexiconToneBackend()
+
+    assert backend.detect("Quarterly logistics spreadsheet reconciliation") == DEFAULT_EMOTION
+    assert backend.detect("I am worried about the risks") == "concerned"
+
+
+@pytest.mark.parametrize("message, emotion", [
+    ("I'm furious about what happened!", "angry"),
+    ("What a lovely day, I'm so happy.", "joyful"),
+    ("That is terrible news, I am so sad.", "sad"),
+    ("I'm afraid of what comes next.", "fearful"),
+    ("Why would anyone think that, and what could we do?", DEFAULT_EMOTION),
+])
+def test_lexicon_labels_core_emotions(message, emotion):
+    assert LexiconToneBackend().detect(message) == emotion
+
+
+def test_lexicon_cues_do_not_outweigh_emotion_words():
+    backend = LexiconToneBackend()
+
+    assert backend.detect("Historically, we should consider the broader implications.") == "reflective"
+    assert backend.detect("Perhaps, historically, I am just so happy.") == "joyful"
+
+
+def test_lexicon_tie_falls_back_to_default():
+    assert LexiconToneBackend().detect("I am happy but also sad.") == DEFAULT_EMOTION
+
+
+def test_scripted_mode_emits_events_per_line_without_batching(monkeypatch):
+    events = []
+
+    class RecordingBackend(ToneBackend):
+        def detect_batch(self, messages, base_tone="professional", usage=None, agents=None, turns=None):
+            events.append(("detect", len(messages)))
+            return ["calm"] * len(messages)
+
+    monkeypatch.setitem(TONE_BACKENDS, "recording", RecordingBackend)
+    sim = AgentSimulator(config=ConversationConfig(**{
+        "turns": 3,
+        "topic": "Testing",
+        "tone": "formal",
+        "voices": ["voice1", "voice2"],
+        "tts_provider": "gtts",
+        "mode": "scripted",
+        "tone_backend": "recording",
+        "scripted_messages": ["Agent A: One.", "Agent B: Two.", "Agent A: Three."],
+    }))
+    sim._notify_observers = lambda event_type, data: events.append((event_type, data.get("turn")))
+    sim._run_scripted_conversation()
+    sim.close()
+
+    assert events[1:] == [
+        ("detect", 1), ("message_processed", 1),
+        ("detect", 1), ("message_processed", 2),
+        ("detect", 1), ("message_processed", 3),
+    ]
@@ -0,0 +1,27 @@
+import json
+
+from agentic_sdk.transcript import save_transcript, save_usage_report
+from agentic_sdk.usage import UsageTracker
+
+
+def test_transcript_is_a_list(tmp_path):
+    path = tmp_path / "scripted" / "transcript.json"
+    messages = ["Agent A (curious): Hello.", 'Agent B (calm): "Hi" there.']
+
+    save_transcript(iter(messages), str(path))
+    assert json.loads(path.read_text()) == messages
+    assert path.read_text() == json.dumps(messages, indent=2)
+
+    save_transcript([], str(path))
+    assert json.loads(path.read_text()) == []
+
+
+def test_usage_report_is_written_separately(tmp_path):
+    usage = UsageTracker()
+    usage.record("generation", "gpt-4o-mini", prompt_tokens=1000, completion_tokens=500, agent="agent_a", turn=1)
+    path = tmp_path / "scripted" / "usage.json"
+
+    save_usage_report(usage.summary(), str(path))
+    report = json.loads(path.read_text())
+    assert report["totals"]["total_tokens"] == 1500
+    assert report["by_stage"]["generation"]["calls"] == 1